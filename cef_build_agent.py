@@ -14,14 +14,19 @@ Designed to work standalone or in conjunction with cef_upgrade_agent.py
 """
 
 import os
+import re
 import sys
+import codecs
+import atexit
 import argparse
 import platform
 import subprocess
 import shutil
 import json
+import time
+import hashlib
 import zipfile
-import xml.etree.ElementTree as ET
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -36,28 +41,59 @@ except ImportError:
     print("Install with: pip install requests")
 
 
+_SEP = "=" * 70
+
+
 class Logger:
     """Handles logging to both console and file."""
     
-    def __init__(self, log_dir: Path):
+    LEVELS = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+    
+    def __init__(self, log_dir: Path, verbosity: str = "INFO"):
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
         
         self.commands_log = log_dir / "build-commands.log"
         self.jsonl_log = log_dir / "build-run.jsonl"
         
-        # Clear existing logs
-        self.commands_log.write_text("")
-        self.jsonl_log.write_text("")
+        # Open (and clear) the logs once; line buffering keeps them tail-able
+        # without paying an open/close per message
+        self._cmd_fh = open(self.commands_log, "w", encoding="utf-8", buffering=1)
+        self._jsonl_fh = open(self.jsonl_log, "w", encoding="utf-8", buffering=1)
+        atexit.register(self.close)
+        
+        # JSONL entries are written in batches; errors are flushed immediately
+        self._jsonl_buf: List[str] = []
+        self._flush_every = 64
+        
+        # Messages below this level only go to commands.log
+        self._min_level = self.LEVELS.get(verbosity, 20)
+        
+        # Timestamps are formatted at most once per millisecond
+        self._ts_ms = 0
+        self._ts = ""
+    
+    def _timestamp(self) -> str:
+        """Get the current ISO timestamp, reusing it within the same millisecond."""
+        now_ms = int(time.time() * 1000)
+        if now_ms != self._ts_ms:
+            self._ts_ms = now_ms
+            self._ts = datetime.fromtimestamp(now_ms / 1000).isoformat(timespec="milliseconds")
+        return self._ts
     
-    def log(self, message: str, level: str = "INFO"):
+    def log(self, message: str, level: str = "INFO", console: bool = True):
         """Log a message to console and file."""
-        timestamp = datetime.now().isoformat()
-        print(message)
+        timestamp = self._timestamp()
         
         # Write to commands.log
-        with open(self.commands_log, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {message}\n")
+        self._cmd_fh.write(f"[{timestamp}] {message}\n")
+        
+        if self.LEVELS.get(level, 20) < self._min_level:
+            return
+        
+        # One write per message (print issues separate writes for the text and newline)
+        if console:
+            sys.stdout.write(f"{message}\n")
         
         # Write to JSONL
         log_entry = {
@@ -65,17 +101,105 @@ class Logger:
             "level": level,
             "message": message
         }
-        with open(self.jsonl_log, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        self._jsonl_buf.append(json.dumps(log_entry) + "\n")
+        if len(self._jsonl_buf) >= self._flush_every or level == "ERROR":
+            self.flush()
+    
+    def flush(self):
+        """Write any buffered JSONL entries to disk."""
+        if self._jsonl_buf and not self._jsonl_fh.closed:
+            self._jsonl_fh.write("".join(self._jsonl_buf))
+            self._jsonl_buf.clear()
+    
+    def close(self):
+        """Flush and close the log files."""
+        self.flush()
+        for fh in (self._cmd_fh, self._jsonl_fh):
+            if not fh.closed:
+                fh.close()
+    
+    def log_debug(self, message: str):
+        """Log a message that is only shown when verbosity is DEBUG."""
+        self.log(message, level="DEBUG")
     
     def log_command(self, command: str, output: str = "", returncode: int = 0):
         """Log a command execution."""
-        self.log(f"COMMAND: {command}")
+        # Callers already echo "Running: <command>", so keep the repeat out of the
+        # console; it is still recorded in both log files
+        self.log(f"COMMAND: {command}", console=False)
         if output:
             self.log(f"OUTPUT:\n{output}")
         self.log(f"RETURN CODE: {returncode}")
 
 
+def _get_vswhere_path() -> Path:
+    """Get the path to the Visual Studio Installer's vswhere.exe."""
+    return Path(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")) / "Microsoft Visual Studio" / "Installer" / "vswhere.exe"
+
+
+class _ToolCache:
+    """
+    Persists Visual Studio tool discovery results across runs.
+    
+    Entries are keyed by the vswhere.exe modification time, so the cache is
+    invalidated whenever the Visual Studio Installer is updated.
+    """
+    
+    CACHE_PATH = Path("temp/tool-cache.json")
+    
+    def __init__(self, vswhere_path: Path, cache_path: Optional[Path] = None):
+        self.cache_path = cache_path or self.CACHE_PATH
+        self.vswhere_mtime = vswhere_path.stat().st_mtime
+        self.data = self._load()
+    
+    def _load(self) -> Dict:
+        """Load the cache, discarding it if vswhere has changed."""
+        try:
+            data = json.loads(self.cache_path.read_text(encoding="utf-8"))
+            if data.get("vswhere_mtime") == self.vswhere_mtime:
+                return data
+        except (OSError, ValueError):
+            pass
+        return {"vswhere_mtime": self.vswhere_mtime}
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached value."""
+        return self.data.get(key)
+    
+    def set(self, key: str, value: str):
+        """Store a value and persist the cache."""
+        self.data[key] = value
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            self.cache_path.write_text(json.dumps(self.data, indent=2), encoding="utf-8")
+        except OSError:
+            pass
+
+
+class _ProgressReader:
+    """File-like wrapper that prints download progress and hashes data as it is read."""
+    
+    def __init__(self, raw, total_size: int):
+        self.raw = raw
+        self.total_size = total_size
+        self.downloaded = 0
+        self.sha256 = hashlib.sha256()
+        self._last_print = 0.0
+    
+    def read(self, size: int = -1) -> bytes:
+        chunk = self.raw.read(size)
+        self.downloaded += len(chunk)
+        self.sha256.update(chunk)
+        if self.total_size > 0:
+            # Throttle progress output to ~20 updates per second
+            now = time.monotonic()
+            if now - self._last_print > 0.05 or self.downloaded >= self.total_size:
+                self._last_print = now
+                progress = (self.downloaded / self.total_size) * 100
+                print(f"\rProgress: {progress:.1f}%", end="", flush=True)
+        return chunk
+
+
 class CMakeDownloader:
     """Downloads and installs CMake."""
     
@@ -99,9 +223,9 @@ class CMakeDownloader:
     
     def download_cmake(self, version: str, download_dir: Path, dry_run: bool = False) -> Optional[Path]:
         """Download CMake binary distribution."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("Downloading CMake")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         
         if not REQUESTS_AVAILABLE:
             self.logger.log("ERROR: 'requests' library required for downloading")
@@ -119,13 +243,13 @@ class CMakeDownloader:
         
         if dry_run:
             self.logger.log(f"[DRY RUN] Would download to: {download_path}")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return download_path
         
         # Check if already downloaded
         if download_path.exists():
             self.logger.log(f"✓ CMake already downloaded: {download_path}")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return download_path
         
         try:
@@ -136,89 +260,216 @@ class CMakeDownloader:
             
             total_size = int(response.headers.get('content-length', 0))
             
+            # Let shutil drive the copy loop in 1 MiB blocks; progress is reported as it reads
+            response.raw.decode_content = True
+            reader = _ProgressReader(response.raw, total_size)
             with open(download_path, 'wb') as f:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\rProgress: {progress:.1f}%", end="", flush=True)
+                shutil.copyfileobj(reader, f, length=1024 * 1024)
             
             print()  # New line after progress
             
+            # Verify against Kitware's published checksums (hashed while downloading)
+            expected_sha256 = self.get_cmake_checksums(version, download_dir).get(filename)
+            if expected_sha256:
+                actual_sha256 = reader.sha256.hexdigest()
+                if actual_sha256 != expected_sha256:
+                    download_path.unlink()
+                    self.logger.log(f"✗ Checksum mismatch for {filename}", level="ERROR")
+                    self.logger.log(f"  Expected: {expected_sha256}")
+                    self.logger.log(f"  Actual:   {actual_sha256}")
+                    self.logger.log(_SEP + "\n")
+                    return None
+                self.logger.log("✓ SHA-256 checksum verified")
+            else:
+                self.logger.log("⚠ No published checksum found, skipping verification")
+            
             self.logger.log(f"✓ Download complete: {download_path}")
             self.logger.log(f"  Size: {download_path.stat().st_size / (1024*1024):.2f} MB")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             
             return download_path
             
         except Exception as e:
             self.logger.log(f"✗ Download failed: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return None
     
+    def get_cmake_checksums(self, version: str, download_dir: Path) -> Dict[str, str]:
+        """Get the published SHA-256 checksums for a CMake release, keyed by filename."""
+        filename = f"cmake-{version}-SHA-256.txt"
+        checksums_path = download_dir / filename
+        
+        try:
+            # The checksum list never changes for a release, so fetch it only once
+            if not checksums_path.exists():
+                response = requests.get(f"{self.CMAKE_DOWNLOAD_BASE}/v{version}/{filename}", timeout=30)
+                response.raise_for_status()
+                checksums_path.write_text(response.text, encoding="utf-8")
+            
+            checksums = {}
+            for line in checksums_path.read_text(encoding="utf-8").splitlines():
+                parts = line.split()
+                if len(parts) == 2:
+                    checksums[parts[1]] = parts[0].lower()
+            return checksums
+            
+        except Exception as e:
+            self.logger.log(f"⚠ Could not fetch CMake checksums: {e}")
+            return {}
+    
     def extract_cmake(self, archive_path: Path, extract_dir: Path, dry_run: bool = False) -> Optional[Path]:
         """Extract CMake archive and return path to cmake executable."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("Extracting CMake")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         
         if dry_run:
             self.logger.log(f"[DRY RUN] Would extract {archive_path} to {extract_dir}")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return extract_dir / "bin" / "cmake.exe" if self.os_type == "Windows" else extract_dir / "bin" / "cmake"
         
         try:
             extract_dir.mkdir(parents=True, exist_ok=True)
             
+            # Reuse a previous extraction of the same archive
+            cmake_exe = self._read_extraction_marker(archive_path.name, extract_dir)
+            if cmake_exe:
+                self.logger.log(f"✓ CMake already extracted: {cmake_exe}")
+                self.logger.log(_SEP + "\n")
+                return cmake_exe
+            
+            # Locate cmake from the archive listing instead of walking the extracted tree
             if archive_path.suffix == ".zip":
                 with zipfile.ZipFile(archive_path, 'r') as zip_ref:
-                    zip_ref.extractall(extract_dir)
+                    names = zip_ref.namelist()
+                cmake_member = self._find_cmake_member(archive_path.name, names)
+                self._extract_zip(archive_path, names, extract_dir)
             else:
                 import tarfile
                 with tarfile.open(archive_path, 'r:*') as tar_ref:
                     tar_ref.extractall(extract_dir)
+                    # Members are cached by extractall, so this does not re-read the archive
+                    cmake_member = self._find_cmake_member(archive_path.name, tar_ref.getnames())
             
-            # Find cmake executable
-            cmake_exe = None
-            for root, dirs, files in os.walk(extract_dir):
-                if "cmake.exe" in files or "cmake" in files:
-                    cmake_name = "cmake.exe" if self.os_type == "Windows" else "cmake"
-                    cmake_exe = Path(root) / cmake_name
-                    break
+            cmake_exe = extract_dir / cmake_member if cmake_member else None
             
             if cmake_exe and cmake_exe.exists():
+                self._extraction_marker(archive_path.name, extract_dir).write_text(cmake_member, encoding="utf-8")
                 self.logger.log(f"✓ CMake extracted: {cmake_exe}")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(_SEP + "\n")
                 return cmake_exe
             else:
                 self.logger.log("✗ Could not find cmake executable")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(_SEP + "\n")
                 return None
             
         except Exception as e:
             self.logger.log(f"✗ Extraction failed: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
+            return None
+    
+    def _extract_zip(self, archive_path: Path, names: List[str], extract_dir: Path):
+        """Extract a zip archive concurrently, one ZipFile reader per worker."""
+        # Create the directory skeleton up front so workers never race on makedirs
+        for name in names:
+            parts = name.split("/")[:-1]
+            if parts and ".." not in parts and not os.path.isabs(name):
+                extract_dir.joinpath(*parts).mkdir(parents=True, exist_ok=True)
+        
+        # ZipFile handles are not safe to share between threads, so each batch opens its own
+        workers = min(8, os.cpu_count() or 1)
+        batches = [names[i::workers] for i in range(workers)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(self._extract_zip_members, archive_path, batch, extract_dir)
+                for batch in batches if batch
+            ]
+            for future in futures:
+                future.result()
+    
+    @staticmethod
+    def _extract_zip_members(archive_path: Path, names: List[str], extract_dir: Path):
+        """Extract the given members of a zip archive."""
+        with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+            for name in names:
+                zip_ref.extract(name, extract_dir)
+    
+    def find_extracted_cmake(self, version: str, extract_dir: Path) -> Optional[Path]:
+        """Return the cmake executable from a previous extraction of this version, if any."""
+        download_url = self.get_cmake_download_url(version)
+        if not download_url:
             return None
+        return self._read_extraction_marker(download_url.split("/")[-1], extract_dir)
+    
+    def _extraction_marker(self, archive_name: str, extract_dir: Path) -> Path:
+        """Get the marker file recording a completed extraction of an archive."""
+        return extract_dir / f".{archive_name}.extracted"
+    
+    def _read_extraction_marker(self, archive_name: str, extract_dir: Path) -> Optional[Path]:
+        """Get the cmake executable recorded by an extraction marker, if still present."""
+        marker = self._extraction_marker(archive_name, extract_dir)
+        if not marker.exists():
+            return None
+        cmake_exe = extract_dir / marker.read_text(encoding="utf-8").strip()
+        return cmake_exe if cmake_exe.exists() else None
+    
+    def _find_cmake_member(self, archive_name: str, names: List[str]) -> Optional[str]:
+        """Find the cmake executable among archive member names."""
+        # Official archives have a fixed layout, so try the known location first
+        expected = self._expected_cmake_member(archive_name)
+        if expected in names:
+            return expected
+        
+        cmake_name = "cmake.exe" if self.os_type == "Windows" else "cmake"
+        for name in names:
+            if name.endswith(f"/bin/{cmake_name}"):
+                return name
+        return None
+    
+    def _expected_cmake_member(self, archive_name: str) -> str:
+        """Get the cmake executable's path inside an official CMake archive."""
+        top_dir = archive_name
+        for suffix in (".zip", ".tar.gz"):
+            if top_dir.endswith(suffix):
+                top_dir = top_dir[:-len(suffix)]
+        
+        if self.os_type == "Windows":
+            return f"{top_dir}/bin/cmake.exe"
+        elif self.os_type == "Darwin":
+            return f"{top_dir}/CMake.app/Contents/bin/cmake"
+        else:
+            return f"{top_dir}/bin/cmake"
 
 
 class CMakeConfigurator:
     """Configures and generates CMake projects."""
     
+    CMAKE_VERSION_RE = re.compile(r"cmake version (\d+)\.(\d+)")
+    MSVC_RUNTIME_CACHE_RE = re.compile(r"^CMAKE_MSVC_RUNTIME_LIBRARY:\w+=(.*)$", re.MULTILINE)
+    GENERATOR_CACHE_RE = re.compile(r"^CMAKE_GENERATOR:\w+=(.*)$", re.MULTILINE)
+    PLATFORM_CACHE_RE = re.compile(r"^CMAKE_GENERATOR_PLATFORM:\w+=(.*)$", re.MULTILINE)
+    
+    # Files that only exist once CMake has finished generating the build system
+    GENERATED_FILES = ("CMakeFiles/generate.stamp", "*.sln", "Makefile", "build.ninja")
+    
     def __init__(self, logger: Logger, cmake_path: Path):
         self.logger = logger
         self.cmake_path = cmake_path
         self.os_type = platform.system()
+        self._cmake_version = None
+        
+        # True once the MSVC runtime library has been set through CMake itself,
+        # which makes editing the generated project files unnecessary
+        self.runtime_configured = False
     
     def configure(self, source_dir: Path, build_dir: Path, 
                   generator: str = None, platform_arch: str = "x64", 
-                  dry_run: bool = False) -> bool:
+                  dry_run: bool = False, reconfigure: bool = False,
+                  runtime_library: str = "MultiThreadedDLL") -> bool:
         """Run CMake configure step."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("CMake Configure")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         
         # Determine generator
         if not generator:
@@ -235,9 +486,28 @@ class CMakeConfigurator:
         
         if dry_run:
             self.logger.log("[DRY RUN] Would run CMake configure")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
         
+        # Debug configurations get the matching debug runtime
+        use_dll = runtime_library.endswith("DLL")
+        msvc_runtime = "MultiThreaded$<$<CONFIG:Debug>:Debug>" + ("DLL" if use_dll else "")
+        
+        # An existing cache means the compiler checks have already run for this tree
+        cache_path = build_dir / "CMakeCache.txt"
+        if not reconfigure and cache_path.exists():
+            cache = cache_path.read_text(encoding="utf-8", errors="replace")
+            if self._cache_matches(cache, build_dir, generator, platform_arch):
+                match = self.MSVC_RUNTIME_CACHE_RE.search(cache)
+                self.runtime_configured = match is not None and match.group(1) == msvc_runtime
+                self.logger.log("✓ Reusing existing CMake configuration (use --reconfigure to force)")
+                self.logger.log(_SEP + "\n")
+                return True
+            
+            # CMake refuses to switch generator or platform on an existing cache
+            cache_path.unlink()
+            shutil.rmtree(build_dir / "CMakeFiles", ignore_errors=True)
+        
         try:
             build_dir.mkdir(parents=True, exist_ok=True)
             
@@ -251,6 +521,23 @@ class CMakeConfigurator:
             if platform_arch and self.os_type == "Windows":
                 cmd.extend(["-A", platform_arch])
             
+            # Set the runtime library at generation time (CMake 3.15+). CEF's own
+            # CEF_RUNTIME_LIBRARY_FLAG defaults to /MT, so override that as well.
+            set_runtime = self.os_type == "Windows" and (self._get_cmake_version() or (0, 0)) >= (3, 15)
+            if set_runtime:
+                cmd.extend([
+                    "-DCMAKE_POLICY_DEFAULT_CMP0091=NEW",
+                    f"-DCMAKE_MSVC_RUNTIME_LIBRARY={msvc_runtime}",
+                    f"-DCEF_RUNTIME_LIBRARY_FLAG={'/MD' if use_dll else '/MT'}",
+                ])
+            
+            # Compiler launchers are only honoured by Makefile/Ninja generators
+            if not generator.startswith("Visual Studio") and shutil.which("ccache"):
+                cmd.extend([
+                    "-DCMAKE_C_COMPILER_LAUNCHER=ccache",
+                    "-DCMAKE_CXX_COMPILER_LAUNCHER=ccache",
+                ])
+            
             self.logger.log(f"Running: {' '.join(cmd)}")
             
             result = subprocess.run(
@@ -263,36 +550,77 @@ class CMakeConfigurator:
             self.logger.log_command(' '.join(cmd), result.stdout + result.stderr, result.returncode)
             
             if result.returncode == 0:
+                self.runtime_configured = set_runtime
                 self.logger.log("✓ CMake configure successful")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(_SEP + "\n")
                 return True
             else:
                 self.logger.log(f"✗ CMake configure failed with code {result.returncode}", level="ERROR")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(_SEP + "\n")
                 return False
                 
         except Exception as e:
             self.logger.log(f"✗ CMake configure failed: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
+            return False
+    
+    def _cache_matches(self, cache: str, build_dir: Path, generator: str, platform_arch: str) -> bool:
+        """Check an existing cache was fully generated for the requested generator and platform."""
+        match = self.GENERATOR_CACHE_RE.search(cache)
+        cached_generator = match.group(1).strip() if match else None
+        if cached_generator != generator:
+            self.logger.log(f"Existing configuration uses generator {cached_generator!r}, reconfiguring")
             return False
+        
+        # The platform is only passed (-A) on Windows
+        if platform_arch and self.os_type == "Windows":
+            match = self.PLATFORM_CACHE_RE.search(cache)
+            cached_platform = match.group(1).strip() if match else None
+            if cached_platform != platform_arch:
+                self.logger.log(f"Existing configuration targets platform {cached_platform!r}, reconfiguring")
+                return False
+        
+        # An interrupted configure leaves a cache behind without the build system
+        if not any(any(build_dir.glob(pattern)) for pattern in self.GENERATED_FILES):
+            self.logger.log("Existing configuration was never generated, reconfiguring")
+            return False
+        
+        return True
     
     def generate(self, build_dir: Path, dry_run: bool = False) -> bool:
         """Run CMake generate step (usually automatic with configure)."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("CMake Generate")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         
         if dry_run:
             self.logger.log("[DRY RUN] Would run CMake generate")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
         
         # In modern CMake, generate happens automatically during configure
         # This is mainly for compatibility
         self.logger.log("✓ Generation completed during configure step")
-        self.logger.log("=" * 70 + "\n")
+        self.logger.log(_SEP + "\n")
         return True
     
+    def _get_cmake_version(self) -> Optional[Tuple[int, int]]:
+        """Get the CMake (major, minor) version, querying the executable only once."""
+        if self._cmake_version is None:
+            self._cmake_version = ()
+            try:
+                result = subprocess.run(
+                    [str(self.cmake_path), "--version"],
+                    capture_output=True,
+                    text=True
+                )
+                match = self.CMAKE_VERSION_RE.search(result.stdout)
+                if match:
+                    self._cmake_version = (int(match.group(1)), int(match.group(2)))
+            except OSError:
+                pass
+        return self._cmake_version or None
+    
     def _detect_vs_generator(self) -> str:
         """Detect available Visual Studio version."""
         # Check for VS installations in order of preference
@@ -303,11 +631,17 @@ class CMakeConfigurator:
             ("Visual Studio 14 2015", "2015"),
         ]
         
-        for generator, year in vs_versions:
-            # Check if vswhere can find this version
-            try:
-                vswhere_path = Path(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")) / "Microsoft Visual Studio" / "Installer" / "vswhere.exe"
-                if vswhere_path.exists():
+        vswhere_path = _get_vswhere_path()
+        if vswhere_path.exists():
+            cache = _ToolCache(vswhere_path)
+            cached = cache.get("vs_generator")
+            if cached:
+                self.logger.log(f"Detected: {cached} (cached)")
+                return cached
+            
+            for generator, year in vs_versions:
+                # Check if vswhere can find this version
+                try:
                     result = subprocess.run(
                         [str(vswhere_path), "-version", f"[{year[0:2]}.0,{int(year[0:2])+1}.0)", "-property", "installationPath"],
                         capture_output=True,
@@ -315,9 +649,10 @@ class CMakeConfigurator:
                     )
                     if result.returncode == 0 and result.stdout.strip():
                         self.logger.log(f"Detected: {generator}")
+                        cache.set("vs_generator", generator)
                         return generator
-            except:
-                pass
+                except:
+                    pass
         
         # Default to VS 2022
         self.logger.log("Using default: Visual Studio 17 2022")
@@ -327,72 +662,86 @@ class CMakeConfigurator:
 class VSProjectModifier:
     """Modifies Visual Studio project files."""
     
+    RELEASE_ITEM_DEFINITION_RE = re.compile(
+        r'<ItemDefinitionGroup\b[^>]*Condition="[^"]*Release[^"]*"[^>]*>.*?</ItemDefinitionGroup>',
+        re.DOTALL
+    )
+    CL_COMPILE_RE = re.compile(r'(<ClCompile>)(.*?)(</ClCompile>)', re.DOTALL)
+    RUNTIME_LIBRARY_RE = re.compile(r'<RuntimeLibrary>[^<]*</RuntimeLibrary>')
+    
     def __init__(self, logger: Logger):
         self.logger = logger
     
     def modify_runtime_library(self, vcxproj_path: Path, runtime: str = "MultiThreadedDLL", 
                                dry_run: bool = False) -> bool:
         """Modify Runtime Library setting in .vcxproj file."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("Modifying Project Properties")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log(f"Project: {vcxproj_path}")
         self.logger.log(f"Setting Runtime Library to: {runtime} (/MD)")
         
         if dry_run:
             self.logger.log("[DRY RUN] Would modify project properties")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
         
         try:
-            # Register namespace
-            ET.register_namespace('', 'http://schemas.microsoft.com/developer/msbuild/2003')
-            
-            tree = ET.parse(vcxproj_path)
-            root = tree.getroot()
-            
-            ns = {'ms': 'http://schemas.microsoft.com/developer/msbuild/2003'}
-            
-            # Find all PropertyGroups with Configuration=Release
-            modified = False
-            for prop_group in root.findall('.//ms:PropertyGroup[@Label="Configuration"]', ns):
-                config = prop_group.get('Condition', '')
-                if 'Release' in config:
-                    # Find or create RuntimeLibrary element
-                    runtime_elem = prop_group.find('ms:RuntimeLibrary', ns)
-                    if runtime_elem is None:
-                        runtime_elem = ET.SubElement(prop_group, 'RuntimeLibrary')
-                    runtime_elem.text = runtime
-                    modified = True
-            
-            # Also check ItemDefinitionGroup
-            for item_def in root.findall('.//ms:ItemDefinitionGroup', ns):
-                config = item_def.get('Condition', '')
-                if 'Release' in config:
-                    cl_compile = item_def.find('ms:ClCompile', ns)
-                    if cl_compile is None:
-                        cl_compile = ET.SubElement(item_def, 'ClCompile')
-                    runtime_elem = cl_compile.find('ms:RuntimeLibrary', ns)
-                    if runtime_elem is None:
-                        runtime_elem = ET.SubElement(cl_compile, 'RuntimeLibrary')
-                    runtime_elem.text = runtime
-                    modified = True
-            
-            if modified:
-                tree.write(vcxproj_path, encoding='utf-8', xml_declaration=True)
+            # Edit the text in place rather than round-tripping through an XML parser,
+            # so formatting is preserved byte-for-byte and only the setting changes
+            raw = vcxproj_path.read_bytes()
+            bom = codecs.BOM_UTF8 if raw.startswith(codecs.BOM_UTF8) else b""
+            text = raw[len(bom):].decode("utf-8")
+            
+            found = False
+            
+            def update_group(group_match):
+                nonlocal found
+                found = True
+                group = group_match.group(0)
+                element = f"<RuntimeLibrary>{runtime}</RuntimeLibrary>"
+                
+                cl_compile = self.CL_COMPILE_RE.search(group)
+                if not cl_compile:
+                    # No ClCompile settings yet; add them right after the opening tag
+                    open_end = group.index(">") + 1
+                    return f"{group[:open_end]}<ClCompile>{element}</ClCompile>{group[open_end:]}"
+                
+                body = cl_compile.group(2)
+                if self.RUNTIME_LIBRARY_RE.search(body):
+                    body = self.RUNTIME_LIBRARY_RE.sub(element, body)
+                else:
+                    stripped = body.rstrip()
+                    indent = body[:len(body) - len(body.lstrip())] or "\n"
+                    body = f"{stripped}{indent}{element}{body[len(stripped):]}"
+                return f"{group[:cl_compile.start(2)]}{body}{group[cl_compile.end(2):]}"
+            
+            new_text = self.RELEASE_ITEM_DEFINITION_RE.sub(update_group, text)
+            
+            if not found:
+                self.logger.log("⚠ No Release configuration found to modify")
+            elif new_text != text:
+                vcxproj_path.write_bytes(bom + new_text.encode("utf-8"))
                 self.logger.log("✓ Project properties modified successfully")
             else:
-                self.logger.log("⚠ No Release configuration found to modify")
+                self.logger.log(f"✓ Runtime Library already set to {runtime}")
             
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
             
         except Exception as e:
             self.logger.log(f"✗ Failed to modify project: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return False
 
 
+def _default_jobs() -> int:
+    """Get the number of CPUs this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
 class VSBuilder:
     """Builds Visual Studio projects using MSBuild."""
     
@@ -402,10 +751,15 @@ class VSBuilder:
     
     def _find_msbuild(self) -> Optional[Path]:
         """Find MSBuild executable."""
-        # Try vswhere first
+        # Try vswhere first (results are cached across runs)
         try:
-            vswhere_path = Path(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")) / "Microsoft Visual Studio" / "Installer" / "vswhere.exe"
+            vswhere_path = _get_vswhere_path()
             if vswhere_path.exists():
+                cache = _ToolCache(vswhere_path)
+                cached = cache.get("msbuild")
+                if cached and Path(cached).exists():
+                    return Path(cached)
+                
                 result = subprocess.run(
                     [str(vswhere_path), "-latest", "-requires", "Microsoft.Component.MSBuild", "-find", "MSBuild\\**\\Bin\\MSBuild.exe"],
                     capture_output=True,
@@ -414,6 +768,7 @@ class VSBuilder:
                 if result.returncode == 0 and result.stdout.strip():
                     msbuild = Path(result.stdout.strip().split('\n')[0])
                     if msbuild.exists():
+                        cache.set("msbuild", str(msbuild))
                         return msbuild
         except:
             pass
@@ -433,25 +788,29 @@ class VSBuilder:
         return None
     
     def build_project(self, solution_or_project: Path, configuration: str = "Release", 
-                     platform: str = "x64", target: str = None, dry_run: bool = False) -> bool:
+                     platform: str = "x64", target: str = None, dry_run: bool = False,
+                     jobs: Optional[int] = None) -> bool:
         """Build a Visual Studio solution or project."""
-        self.logger.log("=" * 70)
+        jobs = jobs or _default_jobs()
+        
+        self.logger.log(_SEP)
         self.logger.log("Building Project")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log(f"Solution/Project: {solution_or_project}")
         self.logger.log(f"Configuration: {configuration}")
         self.logger.log(f"Platform: {platform}")
+        self.logger.log(f"Jobs: {jobs}")
         if target:
             self.logger.log(f"Target: {target}")
         
         if dry_run:
             self.logger.log("[DRY RUN] Would build project")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
         
         if not self.msbuild_path:
             self.logger.log("✗ MSBuild not found. Please install Visual Studio.", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return False
         
         try:
@@ -460,7 +819,10 @@ class VSBuilder:
                 str(solution_or_project),
                 f"/p:Configuration={configuration}",
                 f"/p:Platform={platform}",
-                "/m",  # Multi-processor build
+                f"/maxCpuCount:{jobs}",  # Explicit parallelism; bare /m over-subscribes CPU quotas
+                "/nodeReuse:false",  # Don't leave worker nodes running after the build
+                "/p:UseMultiToolTask=true",
+                "/p:EnforceProcessCountAcrossBuilds=true",
                 "/v:minimal",  # Minimal verbosity
             ]
             
@@ -469,29 +831,65 @@ class VSBuilder:
             
             self.logger.log(f"Running: {' '.join(cmd)}")
             
-            result = subprocess.run(
+            # Stream output as it is produced rather than buffering the whole build log
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
-                text=True
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1
             )
+            with proc.stdout:
+                for line in proc.stdout:
+                    self.logger.log(line.rstrip())
+            returncode = proc.wait()
             
-            self.logger.log_command(' '.join(cmd), result.stdout + result.stderr, result.returncode)
+            self.logger.log_command(' '.join(cmd), returncode=returncode)
             
-            if result.returncode == 0:
+            if returncode == 0:
                 self.logger.log("✓ Build successful")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(_SEP + "\n")
                 return True
             else:
-                self.logger.log(f"✗ Build failed with code {result.returncode}", level="ERROR")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log(f"✗ Build failed with code {returncode}", level="ERROR")
+                self.logger.log(_SEP + "\n")
                 return False
                 
         except Exception as e:
             self.logger.log(f"✗ Build failed: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return False
 
 
+def _fast_copy(src, dst):
+    """Hard-link src to dst, falling back to a regular copy."""
+    try:
+        if os.path.lexists(dst):
+            if os.path.samefile(src, dst):
+                return dst
+            os.unlink(dst)
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+    return dst
+
+
+def _swap_and_gc(dst: Path, executor: ThreadPoolExecutor):
+    """Move an existing dst directory out of the way and delete it in the background."""
+    if not dst.exists():
+        return
+    
+    tmp = dst.parent / f".{dst.name}.old.{os.getpid()}"
+    try:
+        os.rename(dst, tmp)
+    except OSError:
+        # e.g. files locked on Windows; fall back to deleting in place
+        shutil.rmtree(dst)
+        return
+    executor.submit(shutil.rmtree, tmp, ignore_errors=True)
+
+
 class BinaryCollector:
     """Collects and deploys CEF binaries."""
     
@@ -501,9 +899,9 @@ class BinaryCollector:
     def collect_binaries(self, cef_source_dir: Path, build_dir: Path, 
                         target_dir: Path, dry_run: bool = False) -> bool:
         """Collect all required binaries and deploy to target directory."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("Collecting and Deploying Binaries")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         
         collections = {
             "include": cef_source_dir / "include",
@@ -518,70 +916,76 @@ class BinaryCollector:
             self.logger.log("[DRY RUN] Would collect and deploy:")
             for name, path in collections.items():
                 self.logger.log(f"  - {name}: {path}")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
         
         try:
             target_dir.mkdir(parents=True, exist_ok=True)
             
-            # Copy include folder
-            include_src = collections["include"]
-            include_dst = target_dir / "include"
-            if include_src.exists():
-                if include_dst.exists():
-                    shutil.rmtree(include_dst)
-                shutil.copytree(include_src, include_dst)
-                self.logger.log(f"✓ Copied include folder: {include_dst}")
-            else:
-                self.logger.log(f"⚠ Include folder not found: {include_src}")
-            
-            # Copy Release binaries
-            release_src = collections["Release"]
-            if release_src.exists():
-                for item in release_src.iterdir():
-                    dst = target_dir / item.name
-                    if item.is_file():
-                        shutil.copy2(item, dst)
-                    else:
-                        if dst.exists():
-                            shutil.rmtree(dst)
-                        shutil.copytree(item, dst)
-                self.logger.log(f"✓ Copied Release binaries")
+            # Hard links only work within a single volume, so decide once up front
+            if os.stat(cef_source_dir).st_dev == os.stat(target_dir).st_dev:
+                copy_file = _fast_copy
             else:
-                self.logger.log(f"⚠ Release folder not found: {release_src}")
-            
-            # Copy Resources
-            resources_src = collections["Resources"]
-            if resources_src.exists():
-                for item in resources_src.iterdir():
-                    dst = target_dir / item.name
-                    if item.is_file():
-                        shutil.copy2(item, dst)
-                    else:
-                        if dst.exists():
-                            shutil.rmtree(dst)
-                        shutil.copytree(item, dst)
-                self.logger.log(f"✓ Copied Resources")
-            else:
-                self.logger.log(f"⚠ Resources folder not found: {resources_src}")
+                copy_file = shutil.copy2
+            
+            # The folder copies are independent and I/O-bound, so run them concurrently
+            # and log the outcomes afterwards in order
+            with ThreadPoolExecutor(max_workers=2) as gc_pool, ThreadPoolExecutor(max_workers=4) as pool:
+                futures = [
+                    pool.submit(self._copy_include, collections["include"],
+                                target_dir / "include", copy_file, gc_pool),
+                    pool.submit(self._copy_folder_contents, collections["Release"],
+                                target_dir, copy_file, gc_pool, "Release binaries"),
+                    pool.submit(self._copy_folder_contents, collections["Resources"],
+                                target_dir, copy_file, gc_pool, "Resources"),
+                ]
+            
+            for future in futures:
+                self.logger.log(future.result())
             
             # Copy libcef_dll_wrapper.lib
             wrapper_src = collections["libcef_dll_wrapper"] / "libcef_dll_wrapper.lib"
             if wrapper_src.exists():
                 wrapper_dst = target_dir / "libcef_dll_wrapper.lib"
-                shutil.copy2(wrapper_src, wrapper_dst)
+                copy_file(wrapper_src, wrapper_dst)
                 self.logger.log(f"✓ Copied libcef_dll_wrapper.lib")
             else:
                 self.logger.log(f"⚠ libcef_dll_wrapper.lib not found: {wrapper_src}")
             
             self.logger.log(f"\n✓ All binaries deployed to: {target_dir}")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return True
             
         except Exception as e:
             self.logger.log(f"✗ Binary collection failed: {e}", level="ERROR")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log(_SEP + "\n")
             return False
+    
+    def _copy_include(self, src: Path, dst: Path, copy_file, gc_pool: ThreadPoolExecutor) -> str:
+        """Replace dst with a copy of the include folder."""
+        if not src.exists():
+            return f"⚠ Include folder not found: {src}"
+        
+        _swap_and_gc(dst, gc_pool)
+        shutil.copytree(src, dst, copy_function=copy_file)
+        return f"✓ Copied include folder: {dst}"
+    
+    def _copy_folder_contents(self, src: Path, dst: Path, copy_file,
+                              gc_pool: ThreadPoolExecutor, label: str) -> str:
+        """Copy the contents of the src folder into dst."""
+        if not src.exists():
+            return f"⚠ {src.name} folder not found: {src}"
+        
+        # scandir entries carry the file type from the directory listing, saving a stat per item
+        with os.scandir(src) as entries:
+            for entry in entries:
+                dst_item = dst / entry.name
+                if entry.is_file():
+                    copy_file(entry.path, dst_item)
+                else:
+                    _swap_and_gc(dst_item, gc_pool)
+                    shutil.copytree(entry.path, dst_item, copy_function=copy_file)
+        return f"✓ Copied {label}"
 
 
 class CEFBuildAgent:
@@ -592,7 +996,7 @@ class CEFBuildAgent:
         
         # Setup directories
         self.log_dir = Path(args.log_dir) / datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.cmake_dir = Path("temp/cmake")
+        self.cmake_dir = Path(args.cmake_dir)
         self.cmake_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize components
@@ -612,13 +1016,13 @@ class CEFBuildAgent:
     
     def run(self):
         """Execute the build process."""
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log("CEF Build Agent - libcef_dll_wrapper Builder")
-        self.logger.log("=" * 70)
+        self.logger.log(_SEP)
         self.logger.log(f"CEF Source: {self.args.cef_source}")
         self.logger.log(f"Output Directory: {self.args.output_dir}")
         self.logger.log(f"Dry Run: {self.args.dry_run}")
-        self.logger.log("=" * 70 + "\n")
+        self.logger.log(_SEP + "\n")
         
         try:
             cef_source = Path(self.args.cef_source)
@@ -628,25 +1032,34 @@ class CEFBuildAgent:
             
             # Step 1: Download CMake (if needed)
             if not self.args.cmake_path:
-                cmake_archive = self.cmake_downloader.download_cmake(
+                cmake_extract_dir = self.cmake_dir / "extracted"
+                cmake_exe = self.cmake_downloader.find_extracted_cmake(
                     self.args.cmake_version,
-                    self.cmake_dir,
-                    self.args.dry_run
+                    cmake_extract_dir
                 )
                 
-                if not cmake_archive:
-                    self.logger.log("✗ Failed to download CMake", level="ERROR")
-                    return 1
-                
-                cmake_exe = self.cmake_downloader.extract_cmake(
-                    cmake_archive,
-                    self.cmake_dir / "extracted",
-                    self.args.dry_run
-                )
-                
-                if not cmake_exe:
-                    self.logger.log("✗ Failed to extract CMake", level="ERROR")
-                    return 1
+                if cmake_exe:
+                    self.logger.log(f"✓ Reusing extracted CMake {self.args.cmake_version}: {cmake_exe}")
+                else:
+                    cmake_archive = self.cmake_downloader.download_cmake(
+                        self.args.cmake_version,
+                        self.cmake_dir,
+                        self.args.dry_run
+                    )
+                    
+                    if not cmake_archive:
+                        self.logger.log("✗ Failed to download CMake", level="ERROR")
+                        return 1
+                    
+                    cmake_exe = self.cmake_downloader.extract_cmake(
+                        cmake_archive,
+                        cmake_extract_dir,
+                        self.args.dry_run
+                    )
+                    
+                    if not cmake_exe:
+                        self.logger.log("✗ Failed to extract CMake", level="ERROR")
+                        return 1
             else:
                 cmake_exe = Path(self.args.cmake_path)
                 if not cmake_exe.exists():
@@ -662,7 +1075,8 @@ class CEFBuildAgent:
                 build_dir,
                 self.args.vs_generator,
                 self.args.platform,
-                self.args.dry_run
+                self.args.dry_run,
+                self.args.reconfigure
             ):
                 self.logger.log("✗ CMake configuration failed", level="ERROR")
                 return 1
@@ -672,9 +1086,11 @@ class CEFBuildAgent:
                 self.logger.log("✗ CMake generation failed", level="ERROR")
                 return 1
             
-            # Step 4: Modify project properties
+            # Step 4: Modify project properties (only needed if CMake couldn't set the runtime)
             wrapper_project = build_dir / "libcef_dll_wrapper" / "libcef_dll_wrapper.vcxproj"
-            if not self.args.dry_run and not wrapper_project.exists():
+            if self.cmake_configurator.runtime_configured:
+                self.logger.log("✓ Runtime Library set during CMake configure, skipping project modification\n")
+            elif not self.args.dry_run and not wrapper_project.exists():
                 self.logger.log(f"⚠ Project file not found: {wrapper_project}")
                 self.logger.log("Skipping property modification...")
             else:
@@ -691,7 +1107,8 @@ class CEFBuildAgent:
                 "Release",
                 self.args.platform,
                 "libcef_dll_wrapper",
-                self.args.dry_run
+                self.args.dry_run,
+                self.args.jobs
             ):
                 self.logger.log("✗ Build failed", level="ERROR")
                 return 1
@@ -710,11 +1127,11 @@ class CEFBuildAgent:
             # Success
             self.results['status'] = 'success'
             
-            self.logger.log("=" * 70)
+            self.logger.log(_SEP)
             self.logger.log("✓ CEF Build Agent Completed Successfully")
             self.logger.log(f"Output Directory: {output_dir}")
             self.logger.log(f"Logs: {self.log_dir}")
-            self.logger.log("=" * 70)
+            self.logger.log(_SEP)
             
             return 0
             
@@ -722,10 +1139,14 @@ class CEFBuildAgent:
             self.logger.log(f"✗ Fatal error: {e}", level="ERROR")
             self.results['status'] = 'error'
             return 1
+        
+        finally:
+            # Flush the JSONL buffer now; in-process callers outlive this run
+            self.logger.close()
 
 
-def main():
-    """Main entry point."""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments (sys.argv[1:] when argv is None)."""
     parser = argparse.ArgumentParser(
         description="CEF Build Agent - Automated libcef_dll_wrapper Builder",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -768,6 +1189,12 @@ Examples:
         help="CMake version to download if --cmake-path not provided (default: 3.30.1)"
     )
     
+    parser.add_argument(
+        "--cmake-dir",
+        default="temp/cmake",
+        help="Directory to download and extract CMake into (default: temp/cmake)"
+    )
+    
     parser.add_argument(
         "--vs-generator",
         help="Visual Studio generator (auto-detected if not provided)"
@@ -779,6 +1206,18 @@ Examples:
         help="Build platform (default: x64)"
     )
     
+    parser.add_argument(
+        "--reconfigure",
+        action="store_true",
+        help="Re-run CMake configure even if the build directory is already configured"
+    )
+    
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        help="Number of parallel MSBuild processes (default: number of available CPUs)"
+    )
+    
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -791,13 +1230,18 @@ Examples:
         help="Directory to store logs (default: temp/cef-build-logs)"
     )
     
-    args = parser.parse_args()
-    
-    # Run the agent
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the agent with parsed arguments and return its exit code."""
     agent = CEFBuildAgent(args)
-    exit_code = agent.run()
-    
-    sys.exit(exit_code)
+    return agent.run()
+
+
+def main():
+    """Main entry point."""
+    sys.exit(run(parse_args()))
 
 
 if __name__ == "__main__":
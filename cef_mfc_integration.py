@@ -13,16 +13,211 @@ This module extends the CEF Unified Agent with MFC-specific deployment.
 
 import os
 import sys
+import errno
 import shutil
 import subprocess
+import functools
+import hashlib
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set
 import json
 
+# Native Windows copy engine (Windows 8+); copies data and attributes in the kernel
+_CopyFile2 = None
+if sys.platform == "win32":
+    import ctypes
+    from ctypes import wintypes
+    try:
+        _CopyFile2 = ctypes.WinDLL("kernel32", use_last_error=True).CopyFile2
+        _CopyFile2.argtypes = [wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p]
+        _CopyFile2.restype = ctypes.c_long
+    except (OSError, AttributeError):
+        _CopyFile2 = None
+
+
+# copy_file_range errors that just mean "not supported here", e.g. cross-filesystem on older kernels
+_COPY_FILE_RANGE_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF}
+
+
+def _copy_file_range(src, dst):
+    """Copy file data in the kernel, letting filesystems that support it reflink the blocks."""
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        remaining = os.fstat(fsrc.fileno()).st_size
+        while remaining > 0:
+            copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+            if copied == 0:
+                break
+            remaining -= copied
+    shutil.copystat(src, dst)
+
+
+def _fast_copy(src, dst):
+    """Copy a file, using CopyFile2 on Windows, copy_file_range on Linux and shutil.copy2 elsewhere."""
+    if _CopyFile2 is not None:
+        hr = _CopyFile2(str(src), str(dst), None)
+        if hr < 0:
+            # Failure HRESULTs carry the Win32 error code in the low word
+            raise ctypes.WinError(hr & 0xFFFF)
+        return dst
+    if hasattr(os, "copy_file_range"):
+        try:
+            _copy_file_range(src, dst)
+            return dst
+        except OSError as e:
+            if e.errno not in _COPY_FILE_RANGE_UNSUPPORTED:
+                raise
+    # shutil.copy2 uses sendfile on Linux, fcopyfile on macOS and a 1 MiB
+    # read/write loop on Windows (shutil's own default there)
+    return shutil.copy2(src, dst)
+
+
+def _link_or_copy(src, dst):
+    """
+    Hard-link src to dst, falling back to a copy when linking is not possible (e.g. across volumes).
+    A linked dst shares its data with src, so it is unlinked first rather than overwritten.
+    """
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+    try:
+        os.link(src, dst)
+    except OSError:
+        _fast_copy(src, dst)
+    return dst
+
+
+def _fast_copytree(src, dst):
+    """Copy the src tree to a new dst, using multi-threaded robocopy on Windows."""
+    if sys.platform != "win32":
+        shutil.copytree(src, dst, copy_function=_fast_copy)
+        return
+    
+    result = subprocess.run(
+        ["robocopy", str(src), str(dst), "/MIR", "/MT:16", "/NFL", "/NDL", "/NP", "/NJH", "/NJS"],
+        capture_output=True,
+        text=True
+    )
+    # robocopy exit codes below 8 mean success (bit flags describing what was copied)
+    if result.returncode >= 8:
+        raise OSError(f"robocopy failed with code {result.returncode}: {result.stdout.strip()}")
+
+
+def _sync_tree(src, dst, copy_function=_fast_copy):
+    """Make dst match src: a full copy when dst is new, an in-place mirror on redeploys."""
+    if os.path.isdir(dst):
+        _mirror_dir(src, dst, copy_function)
+    elif copy_function is _fast_copy:
+        _fast_copytree(src, dst)
+    else:
+        shutil.copytree(src, dst, copy_function=copy_function)
+
+
+def _mirror_dir(src, dst, copy_function=_fast_copy):
+    """Sync dst to match src in place, rewriting only files whose size or mtime differ."""
+    os.makedirs(dst, exist_ok=True)
+    with os.scandir(src) as it:
+        src_entries = {entry.name: entry for entry in it}
+    with os.scandir(dst) as it:
+        dst_entries = {entry.name: entry for entry in it}
+    
+    # Remove destination entries that no longer exist in src or changed type
+    for name, dst_entry in list(dst_entries.items()):
+        src_entry = src_entries.get(name)
+        is_dir = dst_entry.is_dir(follow_symlinks=False)
+        if src_entry is None or src_entry.is_dir(follow_symlinks=False) != is_dir:
+            if is_dir:
+                shutil.rmtree(dst_entry.path)
+            else:
+                os.remove(dst_entry.path)
+            del dst_entries[name]
+    
+    for name, src_entry in src_entries.items():
+        target = os.path.join(dst, name)
+        if src_entry.is_dir(follow_symlinks=False):
+            _mirror_dir(src_entry.path, target, copy_function)
+        elif src_entry.is_file(follow_symlinks=False):
+            dst_entry = dst_entries.get(name)
+            if dst_entry is not None:
+                src_st = src_entry.stat(follow_symlinks=False)
+                dst_st = dst_entry.stat(follow_symlinks=False)
+                if src_st.st_size == dst_st.st_size and int(src_st.st_mtime) == int(dst_st.st_mtime):
+                    continue
+            copy_function(src_entry.path, target)
+
+
+_DEPLOY_MANIFEST = ".cef_deploy_manifest.json"
+_BUILD_MARKER = ".cef_agent_last_build.json"
+
+# Build outputs, intermediates and IDE state under the solution directory; they
+# change on every build, so they must not feed the build signature
+_BUILD_IGNORED_DIRS = {".vs", ".git", "bin", "obj", "ipch", "debug", "release", "x64", "win32", "arm64"}
+_BUILD_IGNORED_FILES = {_BUILD_MARKER, _DEPLOY_MANIFEST}
+_BUILD_IGNORED_EXTENSIONS = (".user", ".aps", ".sdf", ".suo", ".db", ".opendb", ".log", ".tlog")
+
+
+def _fingerprint(path) -> Optional[List[int]]:
+    """Return [size, mtime] for a file, or None if it does not exist."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_size, int(st.st_mtime)]
+
+
+def _copy_if_changed(src, dst, copy_function=_fast_copy):
+    """Copy src to dst unless dst already has the same size and modification time."""
+    src_fp = _fingerprint(src)
+    if src_fp is not None and src_fp == _fingerprint(dst):
+        return dst
+    return copy_function(src, dst)
+
+
+def _build_manifest(root: Path, names: Optional[List[str]] = None) -> Dict[str, List[int]]:
+    """Map every file under root to its [size, mtime], optionally limited to top-level names."""
+    manifest = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root)
+        if rel_dir == ".":
+            rel_dir = ""
+            if names is not None:
+                dirnames[:] = [d for d in dirnames if d in names]
+                filenames = [f for f in filenames if f in names]
+        for filename in filenames:
+            if filename == _DEPLOY_MANIFEST:
+                continue
+            relpath = os.path.join(rel_dir, filename).replace(os.sep, "/")
+            manifest[relpath] = _fingerprint(os.path.join(dirpath, filename))
+    return manifest
+
+
+def _deploy_is_current(manifest: Dict[str, List[int]], dst: Path) -> bool:
+    """Check that dst was deployed from the same sources and its files are still intact."""
+    try:
+        with open(dst / _DEPLOY_MANIFEST, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return False
+    if stored != manifest:
+        return False
+    return all(_fingerprint(dst / relpath) == fp for relpath, fp in manifest.items())
+
+
+def _write_manifest(manifest: Dict[str, List[int]], dst: Path):
+    """Record what was deployed to dst."""
+    with open(dst / _DEPLOY_MANIFEST, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+
 
 class MFCIntegration:
     """Handles MFC GUI integration and deployment."""
     
+    # Directories already created in this process, shared across instances
+    _created_dirs: Set[str] = set()
+    
     def __init__(self, logger, config: Dict):
         self.logger = logger
         self.config = config
@@ -34,47 +229,63 @@ class MFCIntegration:
         
     def validate_paths(self) -> bool:
         """Validate MFC integration paths."""
-        self.logger.log("=" * 70)
-        self.logger.log("MFC Integration - Path Validation")
-        self.logger.log("=" * 70)
+        self.logger.log("=" * 70 + "\nMFC Integration - Path Validation\n" + "=" * 70)
         
         if not self.mfc_solution_path:
-            self.logger.log("⚠ MFC solution path not configured")
-            self.logger.log("  Set 'mfc_solution_path' in config to enable MFC integration")
+            self.logger.log("⚠ MFC solution path not configured\n"
+                            "  Set 'mfc_solution_path' in config to enable MFC integration")
             return False
         
         if not self.mfc_binary_dir:
-            self.logger.log("⚠ MFC binary directory not configured")
-            self.logger.log("  Set 'mfc_binary_dir' in config")
+            self.logger.log("⚠ MFC binary directory not configured\n"
+                            "  Set 'mfc_binary_dir' in config")
             return False
         
         # Check if solution exists
         if not self.mfc_solution_path.exists():
-            self.logger.log(f"✗ MFC solution not found: {self.mfc_solution_path}", level="ERROR")
+            self.logger.log("✗ MFC solution not found: %s", self.mfc_solution_path, level="ERROR")
             return False
         
-        self.logger.log(f"✓ MFC Solution: {self.mfc_solution_path}")
-        self.logger.log(f"✓ MFC Binary Dir: {self.mfc_binary_dir}")
-        self.logger.log(f"✓ MFC CEF Binary Dir: {self.mfc_cef_binary_dir}")
-        self.logger.log("=" * 70 + "\n")
+        self.logger.log("\n".join([
+            f"✓ MFC Solution: {self.mfc_solution_path}",
+            f"✓ MFC Binary Dir: {self.mfc_binary_dir}",
+            f"✓ MFC CEF Binary Dir: {self.mfc_cef_binary_dir}",
+            "=" * 70 + "\n",
+        ]))
         
         return True
     
     def build_mfc_solution(self, configuration: str = "Release", platform: str = "x64", 
-                          dry_run: bool = False) -> bool:
-        """Build MFC GUI solution."""
-        self.logger.log("=" * 70)
-        self.logger.log("Building MFC GUI Solution")
-        self.logger.log("=" * 70)
-        self.logger.log(f"Solution: {self.mfc_solution_path}")
-        self.logger.log(f"Configuration: {configuration}")
-        self.logger.log(f"Platform: {platform}")
+                          dry_run: bool = False, cef_output_dir: Optional[Path] = None) -> bool:
+        """Build MFC GUI solution against the CEF files in cef_output_dir."""
+        self.logger.log("\n".join([
+            "=" * 70,
+            "Building MFC GUI Solution",
+            "=" * 70,
+            f"Solution: {self.mfc_solution_path}",
+            f"Configuration: {configuration}",
+            f"Platform: {platform}",
+        ]))
         
         if dry_run:
-            self.logger.log("[DRY RUN] Would build MFC solution")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log("[DRY RUN] Would build MFC solution\n" + "=" * 70 + "\n")
             return True
         
+        # Skip MSBuild entirely when nothing it depends on changed since the last
+        # good build and everything that build produced is still in place
+        build_signature = self._build_signature(configuration, platform, cef_output_dir)
+        marker = self.mfc_solution_path.parent / _BUILD_MARKER
+        try:
+            with open(marker, "r", encoding="utf-8") as f:
+                last_build = json.load(f)
+            outputs = last_build.get("outputs")
+            if (build_signature is not None and last_build.get("signature") == build_signature and outputs and
+                    all(_fingerprint(self.mfc_binary_dir / relpath) == fp for relpath, fp in outputs.items())):
+                self.logger.log("✓ MFC solution is up to date, skipping build\n" + "=" * 70 + "\n")
+                return True
+        except (OSError, ValueError, AttributeError):
+            pass
+        
         # Find MSBuild
         msbuild_path = self._find_msbuild()
         if not msbuild_path:
@@ -87,76 +298,149 @@ class MFCIntegration:
                 str(self.mfc_solution_path),
                 f"/p:Configuration={configuration}",
                 f"/p:Platform={platform}",
-                "/m",  # Multi-processor build
+                f"/m:{os.cpu_count() or 1}",  # One worker node per CPU
+                "/nodeReuse:false",  # Don't leave idle MSBuild nodes running after the build
+                "/p:UseSharedCompilation=false",  # No Roslyn server for native projects
                 "/v:minimal",
             ]
             
-            self.logger.log(f"Running: {' '.join(cmd)}\n")
+            self.logger.log("Running: %s\n", ' '.join(cmd))
+            build_started = int(time.time()) - 1
             
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Stream the output and keep only the tail for the failure summary
+            tail = deque(maxlen=200)
+            proc = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1
+            )
+            with proc.stdout:
+                for line in proc.stdout:
+                    line = line.rstrip()
+                    self.logger.log(line)
+                    tail.append(line)
+            returncode = proc.wait()
             
-            if result.returncode == 0:
-                self.logger.log("✓ MFC solution built successfully")
-                self.logger.log("=" * 70 + "\n")
+            if returncode == 0:
+                # Files the build just wrote; without any the next run cannot
+                # tell whether they survived, so it builds again
+                outputs = {relpath: fp for relpath, fp in _build_manifest(self.mfc_binary_dir).items()
+                           if fp is not None and fp[1] >= build_started}
+                if build_signature is not None:
+                    with open(marker, "w", encoding="utf-8") as f:
+                        json.dump({"signature": build_signature, "outputs": outputs}, f)
+                self.logger.log("✓ MFC solution built successfully\n" + "=" * 70 + "\n")
                 return True
             else:
-                self.logger.log(f"✗ Build failed with code {result.returncode}", level="ERROR")
-                self.logger.log(f"Error output:\n{result.stderr}")
-                self.logger.log("=" * 70 + "\n")
+                self.logger.log("✗ Build failed with code %d", returncode, level="ERROR")
+                self.logger.log("Last build output:\n" + "\n".join(tail) + "\n" + "=" * 70 + "\n")
                 return False
                 
         except Exception as e:
-            self.logger.log(f"✗ Build failed: {e}", level="ERROR")
+            self.logger.log("✗ Build failed: %s", e, level="ERROR")
             self.logger.log("=" * 70 + "\n")
             return False
     
+    def _build_signature(self, configuration: str, platform: str, cef_output_dir: Optional[Path]) -> Optional[str]:
+        """
+        Hash the size and mtime of every file in the solution directory (outside
+        build output and IDE directories) and of the CEF files about to be deployed.
+        Returns None if any of them cannot be read, so the solution is built.
+        """
+        sig = hashlib.blake2b()
+        sig.update(f"{configuration}|{platform}\n".encode("utf-8"))
+        
+        solution_dir = self.mfc_solution_path.parent
+        output_dirs = {os.path.normcase(os.path.abspath(d)) for d in (self.mfc_binary_dir, self.mfc_cef_binary_dir)}
+        
+        def on_error(error):
+            raise error
+        
+        try:
+            for dirpath, dirnames, filenames in os.walk(solution_dir, onerror=on_error):
+                dirnames[:] = sorted(
+                    d for d in dirnames
+                    if d.lower() not in _BUILD_IGNORED_DIRS and
+                    os.path.normcase(os.path.abspath(os.path.join(dirpath, d))) not in output_dirs
+                )
+                for filename in sorted(filenames):
+                    if filename in _BUILD_IGNORED_FILES or filename.lower().endswith(_BUILD_IGNORED_EXTENSIONS):
+                        continue
+                    path = os.path.join(dirpath, filename)
+                    st = os.stat(path)
+                    relpath = os.path.relpath(path, solution_dir)
+                    sig.update(f"{relpath}|{st.st_size}|{st.st_mtime_ns}\n".encode("utf-8"))
+        except OSError as e:
+            self.logger.log("⚠ Could not read MFC build inputs (%s), building", e)
+            return None
+        
+        if cef_output_dir is not None:
+            sig.update(json.dumps(_build_manifest(cef_output_dir), sort_keys=True).encode("utf-8"))
+        return sig.hexdigest()
+    
     def deploy_cef_binaries(self, cef_output_dir: Path, dry_run: bool = False) -> bool:
         """Deploy CEF binaries to MFC binary directories."""
-        self.logger.log("=" * 70)
-        self.logger.log("Deploying CEF Binaries to MFC Application")
-        self.logger.log("=" * 70)
-        self.logger.log(f"Source: {cef_output_dir}")
-        self.logger.log(f"MFC Binary Dir: {self.mfc_binary_dir}")
-        self.logger.log(f"MFC CEF Binary Dir: {self.mfc_cef_binary_dir}")
+        self.logger.log("\n".join([
+            "=" * 70,
+            "Deploying CEF Binaries to MFC Application",
+            "=" * 70,
+            f"Source: {cef_output_dir}",
+            f"MFC Binary Dir: {self.mfc_binary_dir}",
+            f"MFC CEF Binary Dir: {self.mfc_cef_binary_dir}",
+        ]))
         
         if dry_run:
-            self.logger.log("[DRY RUN] Would deploy CEF binaries to MFC directories")
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log("[DRY RUN] Would deploy CEF binaries to MFC directories\n" + "=" * 70 + "\n")
             return True
         
         try:
             # Create target directories if they don't exist
-            self.mfc_binary_dir.mkdir(parents=True, exist_ok=True)
+            self._ensure_dir(self.mfc_binary_dir)
             if self.mfc_cef_binary_dir:
-                self.mfc_cef_binary_dir.mkdir(parents=True, exist_ok=True)
+                self._ensure_dir(self.mfc_cef_binary_dir)
             
             # Deploy to MFC CEF binary directory (bin\NT\cef\release\x64)
             if self.mfc_cef_binary_dir:
                 self._copy_directory_contents(cef_output_dir, self.mfc_cef_binary_dir)
-                self.logger.log(f"✓ Deployed to MFC CEF directory: {self.mfc_cef_binary_dir}")
+                self.logger.log("✓ Deployed to MFC CEF directory: %s", self.mfc_cef_binary_dir)
             
             # Also copy CEF runtime DLLs to main MFC binary directory
             self._copy_cef_runtime_files(cef_output_dir, self.mfc_binary_dir)
-            self.logger.log(f"✓ Deployed CEF runtime to MFC binary directory: {self.mfc_binary_dir}")
-            
-            self.logger.log("=" * 70 + "\n")
+            self.logger.log("✓ Deployed CEF runtime to MFC binary directory: %s\n%s\n",
+                            self.mfc_binary_dir, "=" * 70)
             return True
             
         except Exception as e:
-            self.logger.log(f"✗ Deployment failed: {e}", level="ERROR")
+            self.logger.log("✗ Deployment failed: %s", e, level="ERROR")
             self.logger.log("=" * 70 + "\n")
             return False
     
+    def _ensure_dir(self, path: Path):
+        """Create a directory once per process; later calls skip the filesystem round trips."""
+        key = str(path)
+        if key not in self._created_dirs:
+            path.mkdir(parents=True, exist_ok=True)
+            self._created_dirs.add(key)
+    
     def _copy_directory_contents(self, src: Path, dst: Path):
         """Copy all contents from source to destination."""
-        for item in src.iterdir():
-            dst_item = dst / item.name
-            if item.is_file():
-                shutil.copy2(item, dst_item)
-            elif item.is_dir():
-                if dst_item.exists():
-                    shutil.rmtree(dst_item)
-                shutil.copytree(item, dst_item)
+        manifest = _build_manifest(src)
+        if _deploy_is_current(manifest, dst):
+            self.logger.log("  %s is already up to date", dst)
+            return
+        
+        with os.scandir(src) as it:
+            for entry in it:
+                dst_item = dst / entry.name
+                if entry.is_file(follow_symlinks=False):
+                    _copy_if_changed(entry.path, dst_item)
+                elif entry.is_dir(follow_symlinks=False):
+                    _sync_tree(entry.path, dst_item)
+        
+        _write_manifest(manifest, dst)
     
     def _copy_cef_runtime_files(self, src: Path, dst: Path):
         """Copy CEF runtime DLLs and resources to MFC binary directory."""
@@ -171,30 +455,45 @@ class MFCIntegration:
             'vulkan-1.dll',
         ]
         
-        for filename in runtime_files:
-            src_file = src / filename
-            if src_file.exists():
-                shutil.copy2(src_file, dst / filename)
-        
-        # Copy resource files
+        # Resource files
         resource_files = ['cef.pak', 'cef_100_percent.pak', 'cef_200_percent.pak', 
                          'cef_extensions.pak', 'devtools_resources.pak', 'icudtl.dat']
         
-        for filename in resource_files:
-            src_file = src / filename
-            if src_file.exists():
-                shutil.copy2(src_file, dst / filename)
+        manifest = _build_manifest(src, runtime_files + resource_files + ['locales'])
+        if _deploy_is_current(manifest, dst):
+            self.logger.log("  %s is already up to date", dst)
+            return
+        
+        available = set(os.listdir(src))
+        jobs = [(src / filename, dst / filename) for filename in runtime_files + resource_files
+                if filename in available]
+        
+        # Hard-link the files from src (the CEF output dir) where possible instead of writing
+        # the bytes again; each is independent, so run concurrently. The build agent already
+        # hard-links src to the CEF SDK's Release files, so all of these copies share one
+        # inode: anything that rewrites one of them in place changes every copy. Files here
+        # must only ever be replaced (unlink, then create), as _link_or_copy does.
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            futures = [pool.submit(_copy_if_changed, src_file, dst_file, _link_or_copy)
+                       for src_file, dst_file in jobs]
+            
+            # Link locales directory
+            if 'locales' in available:
+                futures.append(pool.submit(_sync_tree, src / 'locales', dst / 'locales', _link_or_copy))
+            
+            for future in futures:
+                future.result()
         
-        # Copy locales directory
-        src_locales = src / 'locales'
-        if src_locales.exists():
-            dst_locales = dst / 'locales'
-            if dst_locales.exists():
-                shutil.rmtree(dst_locales)
-            shutil.copytree(src_locales, dst_locales)
+        _write_manifest(manifest, dst)
     
-    def _find_msbuild(self) -> Optional[Path]:
-        """Find MSBuild executable."""
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _find_msbuild() -> Optional[Path]:
+        """Find MSBuild executable (MSBUILD_EXE overrides the vswhere probe)."""
+        override = os.environ.get('MSBUILD_EXE')
+        if override and Path(override).exists():
+            return Path(override)
+        
         try:
             vswhere_path = Path(os.environ.get("ProgramFiles(x86)", "C:\\Program Files (x86)")) / "Microsoft Visual Studio" / "Installer" / "vswhere.exe"
             if vswhere_path.exists():
@@ -215,6 +514,11 @@ class MFCIntegration:
     
     def generate_test_instructions(self, output_path: Path):
         """Generate testing instructions document."""
+        try:
+            build_date = output_path.stat().st_mtime
+        except FileNotFoundError:
+            build_date = 'N/A'
+        
         instructions = f"""# MFC GUI Testing Instructions
 
 ## Post-Build Verification
@@ -315,14 +619,22 @@ If issues occur, rollback to previous CEF version:
 ---
 
 **CEF Version**: {self.config.get('cef_version', 'N/A')}
-**Build Date**: {Path(output_path).stat().st_mtime if output_path.exists() else 'N/A'}
+**Build Date**: {build_date}
 **Configuration**: Release x64
 """
         
         test_instructions_path = output_path.parent / "MFC_TEST_INSTRUCTIONS.md"
-        test_instructions_path.write_text(instructions, encoding='utf-8')
+        try:
+            unchanged = test_instructions_path.read_text(encoding='utf-8') == instructions
+        except (FileNotFoundError, UnicodeDecodeError):
+            unchanged = False
         
-        self.logger.log(f"✓ Test instructions generated: {test_instructions_path}")
+        # Leave an identical file untouched so its mtime doesn't trigger dependents
+        if unchanged:
+            self.logger.log("✓ Test instructions up to date: %s", test_instructions_path)
+        else:
+            test_instructions_path.write_text(instructions, encoding='utf-8')
+            self.logger.log("✓ Test instructions generated: %s", test_instructions_path)
         return test_instructions_path
 
 
@@ -352,17 +664,18 @@ def integrate_with_mfc(unified_agent, dry_run: bool = False) -> bool:
         logger.log("⚠ MFC integration skipped (paths not configured)")
         return True
     
-    # Build MFC solution
+    # Build MFC solution against the CEF output that is deployed next
+    cef_output_dir = Path(config.get('output_directory', 'bin/NT/cef/release'))
     if not mfc.build_mfc_solution(
         config.get('build_configuration', 'Release'),
         config.get('architecture', 'x64'),
-        dry_run
+        dry_run,
+        cef_output_dir
     ):
         logger.log("✗ MFC solution build failed", level="ERROR")
         return False
     
     # Deploy CEF binaries
-    cef_output_dir = Path(config.get('output_directory', 'bin/NT/cef/release'))
     if not mfc.deploy_cef_binaries(cef_output_dir, dry_run):
         logger.log("✗ CEF binary deployment failed", level="ERROR")
         return False
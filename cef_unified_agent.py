@@ -16,45 +16,83 @@ Usage:
 
 import os
 import sys
+import atexit
+import copy
+import io
+import functools
 import json
+import mmap
+import asyncio
 import argparse
+import shlex
 import subprocess
+import time
+from types import MappingProxyType, SimpleNamespace
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional
-
-# Import components from both agents
-sys.path.insert(0, str(Path(__file__).parent))
+from typing import Dict, List, Optional, Set
 
+# Optional faster JSON backend; falls back to the standard library
 try:
-    from cef_upgrade_agent import (
-        Logger as UpgradeLogger,
-        VulnerabilityChecker,
-        CEFDetector,
-        CEFBackup,
-        CEFDownloader,
-        CEFInstaller,
-        CEFVerifier,
-        REQUESTS_AVAILABLE
-    )
-    UPGRADE_AGENT_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import upgrade agent components: {e}")
-    UPGRADE_AGENT_AVAILABLE = False
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 
+
+# Optional compact binary format for the compiled config cache
 try:
-    from cef_build_agent import (
-        Logger as BuildLogger,
-        CMakeDownloader,
-        CMakeConfigurator,
-        VSProjectModifier,
-        VSBuilder,
-        BinaryCollector
-    )
-    BUILD_AGENT_AVAILABLE = True
-except ImportError as e:
-    print(f"Warning: Could not import build agent components: {e}")
-    BUILD_AGENT_AVAILABLE = False
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+
+def _json_loads(data: bytes):
+    """Parse JSON from bytes."""
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def _json_dumps(obj, indent: bool = False) -> bytes:
+    """Serialize to UTF-8 JSON bytes, optionally indented by two spaces."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False).encode("utf-8")
+
+
+def _format_command(cmd: List[str]) -> str:
+    """Render an argument list as a command line that can be pasted into this platform's shell."""
+    if sys.platform == "win32":
+        return subprocess.list2cmdline(cmd)
+    return " ".join(shlex.quote(arg) for arg in cmd)
+
+
+# Both agents are imported lazily, only when their phase runs,
+# so --show-config and skipped phases don't pay for the imports
+sys.path.insert(0, str(Path(__file__).parent))
+
+
+@functools.lru_cache(maxsize=1)
+def _import_upgrade():
+    """Import the upgrade agent's (parse_args, run) on first use; None if unavailable."""
+    try:
+        from cef_upgrade_agent import parse_args, run
+    except ImportError as e:
+        print(f"Warning: Could not import upgrade agent components: {e}")
+        return None
+    return parse_args, run
+
+
+@functools.lru_cache(maxsize=1)
+def _import_build():
+    """Import the build agent's (parse_args, run) on first use; None if unavailable."""
+    try:
+        from cef_build_agent import parse_args, run
+    except ImportError as e:
+        print(f"Warning: Could not import build agent components: {e}")
+        return None
+    return parse_args, run
+
 
 try:
     from cef_mfc_integration import integrate_with_mfc, MFCIntegration
@@ -64,10 +102,53 @@ except ImportError as e:
     MFC_INTEGRATION_AVAILABLE = False
 
 
+@functools.lru_cache(maxsize=None)
+def _ensure_dir(path: str) -> None:
+    """Create a directory (and parents) once per process."""
+    Path(path).mkdir(parents=True, exist_ok=True)
+
+
+# Parsed config files keyed by (resolved path, mtime_ns, size)
+_CONFIG_CACHE: Dict[tuple, Dict] = {}
+
+
+_SUCCESS_TEMPLATE = """
+{sep}
+✓ CEF UNIFIED AGENT COMPLETED SUCCESSFULLY
+{sep}
+
+CEF Version: {version}
+Output Directory: {out}
+
+Phase 1 (Download): {p1}
+Phase 2 (Build): {p2}
+
+Logs Directory: {logs}{details}
+
+{sep}
+"""
+
+_SUCCESS_DETAILS = """
+
+📦 Output Contents:
+  {out}/
+  ├── include/              # CEF headers
+  ├── libcef.dll            # Main CEF library
+  ├── libcef_dll_wrapper.lib # Compiled wrapper
+  ├── *.pak files           # Resources
+  └── locales/              # Locale files
+
+📝 Next Steps:
+  1. Link your application with libcef_dll_wrapper.lib
+  2. Include headers from {out}/include/
+  3. Deploy runtime binaries with your application"""
+
+
 class ConfigManager:
     """Manages configuration loading and validation."""
     
-    DEFAULT_CONFIG = {
+    # Read-only so callers can't accidentally mutate the shared defaults
+    DEFAULT_CONFIG = MappingProxyType({
         "cef_version": "140.1.13+g5eb3258+chromium-140.0.7339.41",
         "platform": "windows64",
         "architecture": "x64",
@@ -77,7 +158,7 @@ class ConfigManager:
         "output_directory": "bin/NT/cef/release",
         "temp_directory": "temp/cef-workflow",
         "runtime_library": "MultiThreadedDLL"
-    }
+    })
     
     def __init__(self, config_path: Optional[Path] = None):
         self.config_path = config_path or Path("cef_config.json")
@@ -87,25 +168,60 @@ class ConfigManager:
         """Load configuration from file or create default."""
         if self.config_path.exists():
             try:
-                with open(self.config_path, 'r') as f:
-                    config = json.load(f)
+                # Reuse the parsed file while it is unchanged on disk
+                st = self.config_path.stat()
+                key = (str(self.config_path.resolve()), st.st_mtime_ns, st.st_size)
+                config = _CONFIG_CACHE.get(key)
+                if config is None:
+                    config = self._load_via_cache(st)
+                    _CONFIG_CACHE[key] = config
                 print(f"✓ Loaded configuration from: {self.config_path}")
-                return {**self.DEFAULT_CONFIG, **config}  # Merge with defaults
+                return {**self.DEFAULT_CONFIG, **copy.deepcopy(config)}  # Merge with defaults
             except Exception as e:
                 print(f"⚠ Error loading config: {e}")
                 print("Using default configuration")
-                return self.DEFAULT_CONFIG.copy()
+                return dict(self.DEFAULT_CONFIG)
         else:
             print(f"⚠ Config file not found: {self.config_path}")
             print("Creating default configuration...")
-            self.save_config(self.DEFAULT_CONFIG)
-            return self.DEFAULT_CONFIG.copy()
+            self.save_config(dict(self.DEFAULT_CONFIG))
+            return dict(self.DEFAULT_CONFIG)
+    
+    def _load_via_cache(self, st: os.stat_result) -> Dict:
+        """Parse the config file, going through a compiled msgpack cache when available."""
+        if not MSGPACK_AVAILABLE:
+            return _json_loads(self.config_path.read_bytes())
+        
+        # The cache records the mtime and size of the JSON it was compiled from
+        cache_path = self.config_path.with_name(self.config_path.name + ".cache")
+        try:
+            with open(cache_path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                mtime_ns, size, config = msgpack.unpackb(mm, raw=False)
+            if (mtime_ns, size) == (st.st_mtime_ns, st.st_size):
+                return config
+        except Exception:
+            pass  # Missing or unreadable cache; rebuild it from the JSON below
+        
+        config = _json_loads(self.config_path.read_bytes())
+        
+        # Write the cache atomically so concurrent runs never read a partial file
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            tmp_path.write_bytes(msgpack.packb([st.st_mtime_ns, st.st_size, config], use_bin_type=True))
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return config
     
     def save_config(self, config: Dict):
         """Save configuration to file."""
+        resolved = str(self.config_path.resolve())
+        for key in [key for key in _CONFIG_CACHE if key[0] == resolved]:
+            del _CONFIG_CACHE[key]
+        
         try:
-            with open(self.config_path, 'w') as f:
-                json.dump(config, f, indent=2)
+            self.config_path.write_bytes(_json_dumps(config, indent=True))
             print(f"✓ Configuration saved to: {self.config_path}")
         except Exception as e:
             print(f"✗ Error saving config: {e}")
@@ -129,39 +245,89 @@ class UnifiedLogger:
     
     def __init__(self, log_dir: Path):
         self.log_dir = log_dir
-        self.log_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(str(self.log_dir))
         
         self.commands_log = log_dir / "unified-commands.log"
         self.jsonl_log = log_dir / "unified-run.jsonl"
         
-        # Clear existing logs
-        self.commands_log.write_text("")
-        self.jsonl_log.write_text("")
+        # Open (and clear) the logs once instead of re-opening them per message
+        self._cmd_fh = open(self.commands_log, "w", encoding="utf-8", buffering=1)
+        # JSONL records are batched in a 64 KiB buffer and flushed at phase boundaries
+        self._jsonl_fh = io.BufferedWriter(open(self.jsonl_log, "wb", buffering=0), 64 * 1024)
+        atexit.register(self.close)
+        
+        # The date/time part of timestamps is formatted at most once per second
+        self._ts_sec = 0
+        self._ts_prefix = ""
+    
+    def _timestamp(self) -> str:
+        """Get the current ISO timestamp with microseconds."""
+        now = time.time()
+        sec = int(now)
+        if sec != self._ts_sec:
+            self._ts_sec = sec
+            self._ts_prefix = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(sec))
+        return f"{self._ts_prefix}.{int((now - sec) * 1e6):06d}"
     
-    def log(self, message: str, level: str = "INFO"):
-        """Log a message to console and file."""
-        timestamp = datetime.now().isoformat()
+    def log(self, message: str, *args, level: str = "INFO", **fields):
+        """
+        Log a message to console and file.
+        
+        %-style args are formatted only when given; extra keyword fields are
+        added to the JSONL record as structured data.
+        """
+        if args:
+            message = message % args
+        timestamp = self._timestamp()
         print(message)
         
         # Write to commands.log
-        with open(self.commands_log, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {message}\n")
+        self._cmd_fh.write(f"[{timestamp}] {message}\n")
         
-        # Write to JSONL
+        # Write to JSONL; errors are flushed immediately
         log_entry = {
             "timestamp": timestamp,
             "level": level,
             "message": message
         }
-        with open(self.jsonl_log, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        log_entry.update(fields)
+        self._jsonl_fh.write(_json_dumps(log_entry) + b"\n")
+        if level == "ERROR":
+            self.flush()
+    
+    def flush(self):
+        """Write any buffered JSONL records to disk."""
+        if not self._jsonl_fh.closed:
+            self._jsonl_fh.flush()
+    
+    def close(self):
+        """Flush and close the log files."""
+        for fh in (self._cmd_fh, self._jsonl_fh):
+            if not fh.closed:
+                fh.close()
     
     def log_command(self, command: str, output: str = "", returncode: int = 0):
         """Log a command execution."""
-        self.log(f"COMMAND: {command}")
+        self.log("COMMAND: %s", command)
         if output:
-            self.log(f"OUTPUT:\n{output}")
-        self.log(f"RETURN CODE: {returncode}")
+            self.log("OUTPUT:\n%s", output)
+        self.log("RETURN CODE: %d", returncode)
+
+
+class RunResults:
+    """Status of each workflow phase."""
+    
+    __slots__ = ('config', 'dry_run', 'phase1_status', 'phase2_status', 'phase3_status',
+                 'overall_status', 'error')
+    
+    def __init__(self, config: Dict, dry_run: bool):
+        self.config = config
+        self.dry_run = dry_run
+        self.phase1_status = 'pending'
+        self.phase2_status = 'pending'
+        self.phase3_status = 'skipped'
+        self.overall_status = 'pending'
+        self.error: Optional[str] = None
 
 
 class CEFUnifiedAgent:
@@ -171,86 +337,91 @@ class CEFUnifiedAgent:
         self.config = config_manager
         self.args = args
         
+        # Attribute snapshot of the merged config (defaults guarantee the standard keys)
+        self.cfg = SimpleNamespace(**self.config.config)
+        
         # Setup directories
-        self.log_dir = Path("temp/cef-unified-logs") / datetime.now().strftime("%Y%m%d_%H%M%S")
-        self.temp_dir = Path(self.config.get("temp_directory", "temp/cef-workflow"))
-        self.output_dir = Path(self.config.get("output_directory", "bin/NT/cef/release"))
+        self._start_dt = datetime.now()
+        self.log_dir = Path(args.log_dir) / self._start_dt.strftime("%Y%m%d_%H%M%S")
+        self.temp_dir = Path(self.cfg.temp_directory)
+        self.output_dir = Path(self.cfg.output_directory)
         
-        self.temp_dir.mkdir(parents=True, exist_ok=True)
+        _ensure_dir(str(self.temp_dir))
         self.cef_install_dir = self.temp_dir / "cef_source"
         
         # Initialize logger
         self.logger = UnifiedLogger(self.log_dir)
         
         # Results tracking
-        self.results = {
-            'config': self.config.config,
-            'dry_run': args.dry_run,
-            'phase1_status': 'pending',
-            'phase2_status': 'pending',
-            'overall_status': 'pending'
-        }
+        self.results = RunResults(self.config.config, args.dry_run)
     
     def run(self):
         """Execute the complete workflow."""
         self.logger.log("=" * 70)
         self.logger.log("CEF UNIFIED AGENT - Complete Download & Build Workflow")
         self.logger.log("=" * 70)
-        self.logger.log(f"Version: 2.0.0")
-        self.logger.log(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        self.logger.log("Version: 2.0.0")
+        self.logger.log("Timestamp: %s", self._start_dt.strftime("%Y-%m-%d %H:%M:%S"))
         self.logger.log("=" * 70)
         
         # Display configuration
         self.config.display()
         
-        self.logger.log(f"CEF Version: {self.config.get('cef_version')}")
-        self.logger.log(f"Output Directory: {self.output_dir}")
-        self.logger.log(f"Dry Run: {self.args.dry_run}")
+        self.logger.log("CEF Version: %s", self.cfg.cef_version)
+        self.logger.log("Output Directory: %s", self.output_dir)
+        self.logger.log("Dry Run: %s", self.args.dry_run)
         self.logger.log("=" * 70 + "\n")
         
         try:
             # Phase 1: Download and Install CEF
             if not self.args.skip_download:
-                if not self.run_phase1_download():
+                phase1_ok = self.run_phase1_download()
+                self.logger.flush()
+                if not phase1_ok:
                     self.logger.log("✗ Phase 1 (Download) failed", level="ERROR")
-                    self.results['overall_status'] = 'failed_phase1'
+                    self.results.overall_status = 'failed_phase1'
                     return 1
-                self.results['phase1_status'] = 'success'
+                self.results.phase1_status = 'success'
             else:
                 self.logger.log("⊘ Skipping Phase 1 (Download) as requested")
-                self.results['phase1_status'] = 'skipped'
+                self.results.phase1_status = 'skipped'
             
             # Phase 2: Build libcef_dll_wrapper
             if not self.args.skip_build:
-                if not self.run_phase2_build():
+                phase2_ok = self.run_phase2_build()
+                self.logger.flush()
+                if not phase2_ok:
                     self.logger.log("✗ Phase 2 (Build) failed", level="ERROR")
-                    self.results['overall_status'] = 'failed_phase2'
+                    self.results.overall_status = 'failed_phase2'
                     return 1
-                self.results['phase2_status'] = 'success'
+                self.results.phase2_status = 'success'
             else:
                 self.logger.log("⊘ Skipping Phase 2 (Build) as requested")
-                self.results['phase2_status'] = 'skipped'
+                self.results.phase2_status = 'skipped'
             
             # Phase 3: MFC Integration (optional)
-            if MFC_INTEGRATION_AVAILABLE and self.config.get('enable_mfc_integration', False):
+            if MFC_INTEGRATION_AVAILABLE and getattr(self.cfg, 'enable_mfc_integration', False):
                 if not integrate_with_mfc(self, self.args.dry_run):
                     self.logger.log("⚠ MFC integration had issues (continuing anyway)", level="WARNING")
-                    self.results['phase3_status'] = 'warning'
+                    self.results.phase3_status = 'warning'
                 else:
-                    self.results['phase3_status'] = 'success'
+                    self.results.phase3_status = 'success'
             else:
-                self.results['phase3_status'] = 'skipped'
+                self.results.phase3_status = 'skipped'
             
             # Success!
-            self.results['overall_status'] = 'success'
+            self.results.overall_status = 'success'
             self.print_success_summary()
             return 0
             
         except Exception as e:
-            self.logger.log(f"✗ Fatal error: {e}", level="ERROR")
-            self.results['overall_status'] = 'error'
-            self.results['error'] = str(e)
+            self.logger.log("✗ Fatal error: %s", e, level="ERROR")
+            self.results.overall_status = 'error'
+            self.results.error = str(e)
             return 1
+        
+        finally:
+            self.logger.close()
     
     def run_phase1_download(self) -> bool:
         """Phase 1: Download and install CEF binaries."""
@@ -258,28 +429,29 @@ class CEFUnifiedAgent:
         self.logger.log("PHASE 1: DOWNLOAD & INSTALL CEF BINARIES")
         self.logger.log("=" * 70 + "\n")
         
-        if not UPGRADE_AGENT_AVAILABLE:
-            self.logger.log("✗ Upgrade agent components not available", level="ERROR")
-            return False
-        
-        # Build command for upgrade agent
-        cmd = [
-            sys.executable,
-            "cef_upgrade_agent.py",
-            "--target-version", self.config.get('cef_version'),
+        # Arguments for upgrade agent
+        agent_args = [
+            "--target-version", self.cfg.cef_version,
             "--install-dir", str(self.cef_install_dir),
             "--log-dir", str(self.log_dir / "phase1-logs"),
+            # Keep downloads and backups under this config's temp directory,
+            # so concurrent matrix runs never share a staging tree
+            "--download-dir", str(self.temp_dir / "downloads"),
+            "--backup-dir", str(self.temp_dir / "backups"),
         ]
         
         if self.args.dry_run:
-            cmd.append("--dry-run")
-        
-        self.logger.log(f"Running: {' '.join(cmd)}\n")
+            agent_args.append("--dry-run")
         
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        # Run in-process rather than paying for a second interpreter start-up;
+        # main() has already checked that the agent imports
+        parse_upgrade_args, run_upgrade_agent = _import_upgrade()
+        self.logger.log("Running: cef_upgrade_agent %s\n", _format_command(agent_args),
+                        command=["cef_upgrade_agent"] + agent_args)
+        returncode = run_upgrade_agent(parse_upgrade_args(agent_args))
         
-        if result.returncode != 0:
-            self.logger.log(f"\n✗ Phase 1 failed with exit code {result.returncode}", level="ERROR")
+        if returncode != 0:
+            self.logger.log("\n✗ Phase 1 failed with exit code %d", returncode, level="ERROR")
             return False
         
         self.logger.log("\n✓ Phase 1 completed successfully\n")
@@ -291,85 +463,187 @@ class CEFUnifiedAgent:
         self.logger.log("PHASE 2: BUILD LIBCEF_DLL_WRAPPER")
         self.logger.log("=" * 70 + "\n")
         
-        if not BUILD_AGENT_AVAILABLE:
-            self.logger.log("✗ Build agent components not available", level="ERROR")
-            return False
-        
         # Find CEF source directory
         if not self.args.dry_run:
-            cef_source_dirs = list(self.cef_install_dir.glob("cef_binary_*"))
-            if not cef_source_dirs:
-                # Try the install dir itself
-                if self.cef_install_dir.exists():
-                    cef_source = self.cef_install_dir
-                else:
-                    self.logger.log(f"✗ CEF source not found in {self.cef_install_dir}", level="ERROR")
-                    return False
-            else:
-                cef_source = cef_source_dirs[0]
+            cef_source = self._find_cef_source()
+            if cef_source is None:
+                self.logger.log("✗ CEF source not found in %s", self.cef_install_dir, level="ERROR")
+                return False
         else:
             cef_source = self.cef_install_dir
         
-        # Build command for build agent
-        cmd = [
-            sys.executable,
-            "cef_build_agent.py",
+        # Arguments for build agent
+        agent_args = [
             "--cef-source", str(cef_source),
             "--output-dir", str(self.output_dir),
-            "--cmake-version", self.config.get('cmake_version'),
-            "--platform", self.config.get('architecture'),
+            "--cmake-version", self.cfg.cmake_version,
+            "--platform", self.cfg.architecture,
             "--log-dir", str(self.log_dir / "phase2-logs"),
+            "--cmake-dir", str(self.temp_dir / "cmake"),
         ]
         
         # Add VS generator if specified
-        vs_generator = self.config.get('vs_generator')
+        vs_generator = self.cfg.vs_generator
         if vs_generator:
-            cmd.extend(["--vs-generator", vs_generator])
+            agent_args.extend(["--vs-generator", vs_generator])
         
         if self.args.dry_run:
-            cmd.append("--dry-run")
-        
-        self.logger.log(f"Running: {' '.join(cmd)}\n")
+            agent_args.append("--dry-run")
         
-        result = subprocess.run(cmd, capture_output=False, text=True)
+        # Run in-process rather than paying for a second interpreter start-up;
+        # main() has already checked that the agent imports
+        parse_build_args, run_build_agent = _import_build()
+        self.logger.log("Running: cef_build_agent %s\n", _format_command(agent_args),
+                        command=["cef_build_agent"] + agent_args)
+        returncode = run_build_agent(parse_build_args(agent_args))
         
-        if result.returncode != 0:
-            self.logger.log(f"\n✗ Phase 2 failed with exit code {result.returncode}", level="ERROR")
+        if returncode != 0:
+            self.logger.log("\n✗ Phase 2 failed with exit code %d", returncode, level="ERROR")
             return False
         
         self.logger.log("\n✓ Phase 2 completed successfully\n")
         return True
     
+    def _find_cef_source(self) -> Optional[Path]:
+        """Find the extracted cef_binary_* directory, or the install dir itself."""
+        try:
+            with os.scandir(self.cef_install_dir) as it:
+                for entry in it:
+                    if entry.name.startswith("cef_binary_") and entry.is_dir():
+                        return Path(entry.path)
+        except FileNotFoundError:
+            return None
+        
+        # Try the install dir itself
+        return self.cef_install_dir
+    
     def print_success_summary(self):
         """Print success summary."""
-        self.logger.log("\n" + "=" * 70)
-        self.logger.log("✓ CEF UNIFIED AGENT COMPLETED SUCCESSFULLY")
-        self.logger.log("=" * 70)
-        self.logger.log(f"\nCEF Version: {self.config.get('cef_version')}")
-        self.logger.log(f"Output Directory: {self.output_dir}")
-        self.logger.log(f"\nPhase 1 (Download): {self.results['phase1_status']}")
-        self.logger.log(f"Phase 2 (Build): {self.results['phase2_status']}")
-        self.logger.log(f"\nLogs Directory: {self.log_dir}")
-        
-        if not self.args.dry_run:
-            self.logger.log(f"\n📦 Output Contents:")
-            self.logger.log(f"  {self.output_dir}/")
-            self.logger.log(f"  ├── include/              # CEF headers")
-            self.logger.log(f"  ├── libcef.dll            # Main CEF library")
-            self.logger.log(f"  ├── libcef_dll_wrapper.lib # Compiled wrapper")
-            self.logger.log(f"  ├── *.pak files           # Resources")
-            self.logger.log(f"  └── locales/              # Locale files")
-            
-            self.logger.log(f"\n📝 Next Steps:")
-            self.logger.log(f"  1. Link your application with libcef_dll_wrapper.lib")
-            self.logger.log(f"  2. Include headers from {self.output_dir}/include/")
-            self.logger.log(f"  3. Deploy runtime binaries with your application")
-        
-        self.logger.log("\n" + "=" * 70 + "\n")
+        self.logger.log(_SUCCESS_TEMPLATE.format(
+            version=self.cfg.cef_version,
+            out=self.output_dir,
+            p1=self.results.phase1_status,
+            p2=self.results.phase2_status,
+            logs=self.log_dir,
+            details="" if self.args.dry_run else _SUCCESS_DETAILS.format(out=self.output_dir),
+            sep="=" * 70
+        ))
 
 
-def main():
-    """Main entry point."""
+async def _run_config_async(config: str, label: str, extra_args: List[str], log_dir: Path) -> int:
+    """Run the workflow for one config in a child process, prefixing its output with the label."""
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--config", config,
+           "--log-dir", str(log_dir)] + extra_args
+    # Unbuffered UTF-8 output so the ✓/✗ markers survive the pipe and lines arrive promptly
+    env = {**os.environ, "PYTHONUNBUFFERED": "1", "PYTHONIOENCODING": "utf-8"}
+    
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.STDOUT,
+        env=env
+    )
+    async for line in proc.stdout:
+        sys.stdout.write(f"[{label}] {line.decode('utf-8', errors='replace').rstrip()}\n")
+    return await proc.wait()
+
+
+def _config_dirs(config: str) -> Set[str]:
+    """Resolve the temp and output directories a config's run writes to."""
+    try:
+        settings = _json_loads(Path(config).read_bytes())
+    except (OSError, ValueError):
+        settings = {}  # The child falls back to the defaults too
+    merged = {**ConfigManager.DEFAULT_CONFIG, **settings}
+    return {os.path.normcase(os.path.abspath(merged[key])) for key in ("temp_directory", "output_directory")}
+
+
+def _group_by_dirs(configs: List[str]) -> List[List[int]]:
+    """Group config indexes so that configs sharing a temp or output directory land in one group."""
+    groups = []  # (directories, config indexes)
+    for i, config in enumerate(configs):
+        dirs, members = _config_dirs(config), [i]
+        for group in [group for group in groups if group[0] & dirs]:
+            groups.remove(group)
+            dirs |= group[0]
+            members = group[1] + members
+        groups.append((dirs, sorted(members)))
+    return [members for _, members in groups]
+
+
+async def _run_matrix_async(configs: List[str], args) -> int:
+    """Run the workflow for several configs concurrently."""
+    extra_args = [flag for flag, enabled in (("--dry-run", args.dry_run),
+                                             ("--skip-download", args.skip_download),
+                                             ("--skip-build", args.skip_build)) if enabled]
+    
+    # Label each run by its config name; each gets its own log directory
+    labels = []
+    for i, config in enumerate(configs):
+        label = Path(config).stem
+        labels.append(label if label not in labels else f"{label}-{i}")
+    
+    # Configs that share a temp or output directory would download, extract
+    # and install over each other, so each such group runs one at a time
+    returncodes = [0] * len(configs)
+    
+    async def run_group(indexes: List[int]):
+        for i in indexes:
+            returncodes[i] = await _run_config_async(configs[i], labels[i], extra_args,
+                                                     Path(args.log_dir) / labels[i])
+    
+    groups = _group_by_dirs(configs)
+    for indexes in groups:
+        if len(indexes) > 1:
+            print(f"⚠ {', '.join(labels[i] for i in indexes)} share a temp or output directory; "
+                  "running them one after another")
+    await asyncio.gather(*[run_group(indexes) for indexes in groups])
+    
+    print("\n" + "=" * 70)
+    print("CONFIGURATION MATRIX RESULTS")
+    print("=" * 70)
+    for label, returncode in zip(labels, returncodes):
+        if returncode == 0:
+            print(f"  ✓ {label}")
+        else:
+            print(f"  ✗ {label} (exit code {returncode})")
+    print("=" * 70 + "\n")
+    
+    return 0 if all(returncode == 0 for returncode in returncodes) else 1
+
+
+def run_matrix(configs: List[str], args) -> int:
+    """Run the workflow for each config file in its own process, overlapping the runs."""
+    if not hasattr(asyncio, "run"):
+        print("ERROR: --configs requires Python 3.7 or higher.")
+        return 1
+    if sys.platform == "win32" and sys.version_info < (3, 8):
+        # Subprocess support needs the proactor event loop, the default only from 3.8
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    return asyncio.run(_run_matrix_async(configs, args))
+
+
+# Boolean flags the fast path in parse_args() understands
+_FAST_PATH_FLAGS = {"--dry-run", "--skip-download", "--skip-build", "--show-config"}
+_DEFAULT_LOG_DIR = "temp/cef-unified-logs"
+
+
+def parse_args(argv: Optional[List[str]] = None):
+    """Parse command line arguments (sys.argv[1:] when argv is None)."""
+    argv = sys.argv[1:] if argv is None else argv
+    
+    # Common invocations only combine boolean flags; skip building the full parser for them
+    if set(argv) <= _FAST_PATH_FLAGS:
+        return SimpleNamespace(
+            config=None,
+            configs=None,
+            dry_run="--dry-run" in argv,
+            skip_download="--skip-download" in argv,
+            skip_build="--skip-build" in argv,
+            show_config="--show-config" in argv,
+            log_dir=_DEFAULT_LOG_DIR
+        )
+    
     parser = argparse.ArgumentParser(
         description="CEF Unified Agent - Complete Download & Build Automation",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -394,6 +668,9 @@ Examples:
   # Only download, skip build
   python cef_unified_agent.py --skip-build
 
+  # Run several configurations concurrently
+  python cef_unified_agent.py --configs x64.json x86.json
+
 Configuration File Format (cef_config.json):
   {
     "cef_version": "140.1.13+g5eb3258+chromium-140.0.7339.41",
@@ -414,6 +691,13 @@ Configuration File Format (cef_config.json):
         help="Path to configuration file (default: cef_config.json)"
     )
     
+    parser.add_argument(
+        "--configs",
+        nargs="+",
+        metavar="CONFIG",
+        help="Run the workflow for several configuration files concurrently"
+    )
+    
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -438,7 +722,22 @@ Configuration File Format (cef_config.json):
         help="Display current configuration and exit"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--log-dir",
+        default=_DEFAULT_LOG_DIR,
+        help=f"Directory for log files (default: {_DEFAULT_LOG_DIR})"
+    )
+    
+    return parser.parse_args(argv)
+
+
+def main():
+    """Main entry point."""
+    args = parse_args()
+    
+    # Configuration matrix: one child process per config file
+    if args.configs:
+        sys.exit(run_matrix(args.configs, args))
     
     # Load configuration
     config_path = Path(args.config) if args.config else None
@@ -450,12 +749,12 @@ Configuration File Format (cef_config.json):
         return 0
     
     # Validate required components
-    if not UPGRADE_AGENT_AVAILABLE and not args.skip_download:
+    if not args.skip_download and _import_upgrade() is None:
         print("ERROR: Upgrade agent components not available.")
         print("Please ensure cef_upgrade_agent.py is in the same directory.")
         return 1
     
-    if not BUILD_AGENT_AVAILABLE and not args.skip_build:
+    if not args.skip_build and _import_build() is None:
         print("ERROR: Build agent components not available.")
         print("Please ensure cef_build_agent.py is in the same directory.")
         return 1
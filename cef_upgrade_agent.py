@@ -15,35 +15,360 @@ Features:
 
 import os
 import sys
+import atexit
+import errno
 import argparse
 import platform
 import subprocess
 import shutil
 import json
+import gzip
 import tarfile
 import zipfile
 import hashlib
+import importlib.util
+import io
+import mmap
+import queue
+import re
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Set, Tuple
 
-# Optional dependency for vulnerability checking
-try:
-    import requests
-    REQUESTS_AVAILABLE = True
-except ImportError:
-    REQUESTS_AVAILABLE = False
+# Optional dependency for vulnerability checking. It is the slowest import
+# here, so it is only located now and imported by _import_requests() when
+# the first HTTP session is created (--help never needs it).
+REQUESTS_AVAILABLE = importlib.util.find_spec("requests") is not None
+if not REQUESTS_AVAILABLE:
     print("WARNING: 'requests' library not found. Vulnerability checking will be disabled.")
     print("Install with: pip install requests")
 
+requests = HTTPAdapter = Retry = None
+
+
+def _import_requests():
+    """Import requests and its urllib3 retry helper into module globals."""
+    global requests, HTTPAdapter, Retry
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+
+# Optional faster JSON backend for the JSONL log
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# tarfile copies member data through a 16KB buffer by default; CEF archives
+# are dominated by large binaries and .pak files
+_TAR_BUFSIZE = 2 * 1024 * 1024
+
+# CEF binaries and .pak files barely compress past level 1, while level 9
+# costs several times the CPU
+_BACKUP_COMPRESSLEVEL = 1
+
+# zstd at level 3 is faster than gzip -1 with a better ratio; backups use it
+# when the zstd CLI (with native tar) or the zstandard module is available
+_ZSTD_LEVEL = 3
+
+try:
+    import zstandard
+    ZSTANDARD_AVAILABLE = True
+except ImportError:
+    ZSTANDARD_AVAILABLE = False
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+# Linux FICLONE ioctl: share the source's extents (btrfs, XFS, bcachefs)
+_FICLONE = 0x40049409
+
+# Errors meaning "this filesystem/kernel cannot do it", so try the next method
+_COPY_FALLBACK_ERRNOS = frozenset(
+    getattr(errno, name) for name in ("EXDEV", "ENOTSUP", "EOPNOTSUPP", "EINVAL", "ENOSYS", "ENOTTY", "EBADF", "ETXTBSY")
+    if hasattr(errno, name)
+)
+
+
+def _file_digest(path: Path, algorithm: str) -> str:
+    """Hex digest of a file, using hashlib.file_digest where available (3.11+)."""
+    with open(path, "rb") as f:
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, algorithm).hexdigest()
+        digest = hashlib.new(algorithm)
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+        return digest.hexdigest()
+
+
+def _preallocate(f, size: int):
+    """
+    Reserve size bytes for a file about to be written, as one contiguous
+    allocation where the OS and filesystem support posix_fallocate.
+    """
+    if hasattr(os, "posix_fallocate"):
+        try:
+            os.posix_fallocate(f.fileno(), 0, size)
+            return
+        except OSError:
+            pass  # e.g. not supported by the filesystem
+    f.truncate(size)
+
+
+def _clone_file(src: str, dst: str) -> int:
+    """
+    Copy a regular file without passing its data through Python where possible.
+    
+    Tries a copy-on-write reflink (FICLONE), then os.copy_file_range, then a
+    1MB read/write loop. Permissions and timestamps are copied as well.
+    
+    Returns:
+        Size of the file in bytes
+    """
+    with open(src, "rb", buffering=0) as fsrc, open(dst, "wb", buffering=0) as fdst:
+        size = os.fstat(fsrc.fileno()).st_size
+        copied = False
+        
+        if fcntl is not None and sys.platform.startswith("linux"):
+            try:
+                fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+                copied = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+        
+        if not copied and hasattr(os, "copy_file_range"):
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+                copied = True
+            except OSError as e:
+                if e.errno not in _COPY_FALLBACK_ERRNOS:
+                    raise
+                fsrc.seek(0)
+                fdst.seek(0)
+                fdst.truncate()
+        
+        if not copied:
+            shutil.copyfileobj(fsrc, fdst, 1024 * 1024)
+    
+    shutil.copystat(src, dst)
+    return size
+
+
+def _extract_tar(tar_ref: tarfile.TarFile, extract_dir: Path):
+    """
+    Extract every member of an open (possibly streaming) tar archive,
+    refusing members or links that would land outside extract_dir.
+    """
+    if hasattr(tarfile, "data_filter"):  # 3.12, backported to 3.8.17+
+        tar_ref.extractall(extract_dir, filter="data")
+        return
+    
+    root = os.path.realpath(extract_dir)
+    for member in tar_ref:
+        names = [member.name]
+        if member.issym():
+            names.append(os.path.join(os.path.dirname(member.name), member.linkname))
+        elif member.islnk():
+            names.append(member.linkname)
+        for name in names:
+            target = os.path.realpath(os.path.join(root, name))
+            if os.path.commonpath([root, target]) != root:
+                raise tarfile.TarError(f"Refusing to extract {member.name!r} outside {extract_dir}")
+        tar_ref.extract(member, extract_dir)
+
+
+class _PrefetchStream(io.RawIOBase):
+    """
+    Read-only file object over a streamed HTTP response.
+    
+    A background thread keeps receiving into a bounded queue while the reader
+    decompresses, and every byte read is folded into a SHA-1 digest.
+    """
+    
+    def __init__(self, response, chunk_size: int, max_chunks: int = 64, cancel: Optional[threading.Event] = None,
+                 progress: Optional[Callable[[float], None]] = None):
+        super().__init__()
+        self.response = response
+        self.cancel = cancel
+        self.progress = progress
+        self.total_size = int(response.headers.get("content-length", 0))
+        self.bytes_read = 0
+        self.sha1 = hashlib.sha1()
+        self.error = None
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._stop = threading.Event()
+        self._view = memoryview(b"")
+        self._eof = False
+        self._thread = threading.Thread(target=self._fill, args=(chunk_size,), name="cef-download", daemon=True)
+        self._thread.start()
+    
+    def _fill(self, chunk_size: int):
+        try:
+            for chunk in self.response.iter_content(chunk_size=chunk_size):
+                if self.cancel is not None and self.cancel.is_set():
+                    raise RuntimeError("Download cancelled")
+                if chunk and not self._put(chunk):
+                    return
+        except Exception as e:
+            self.error = e
+        finally:
+            self._put(None)
+    
+    def _put(self, item) -> bool:
+        """Queue an item, giving up once the stream is closed."""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+    
+    def readable(self) -> bool:
+        return True
+    
+    def readinto(self, b) -> int:
+        if not self._view:
+            if self._eof:
+                return 0
+            if self.cancel is not None and self.cancel.is_set():
+                raise RuntimeError("Download cancelled")
+            chunk = self._queue.get()
+            if chunk is None:
+                self._eof = True
+                if self.error:
+                    raise self.error
+                return 0
+            self.sha1.update(chunk)
+            self.bytes_read += len(chunk)
+            if self.progress is not None and self.total_size > 0:
+                self.progress((self.bytes_read / self.total_size) * 100)
+            self._view = memoryview(chunk)
+        
+        n = min(len(b), len(self._view))
+        b[:n] = self._view[:n]
+        self._view = self._view[n:]
+        return n
+    
+    def close(self):
+        if not self.closed:
+            self._stop.set()
+            self.response.close()
+            self._thread.join()
+        super().close()
+
+
+class ResponseCache:
+    """On-disk cache for JSON HTTP responses, revalidated with ETag/Last-Modified."""
+    
+    CACHE_DIR = Path.home() / ".cache" / "cef-upgrade-agent"
+    MAX_AGE = 3600  # seconds an entry is reused without contacting the server
+    
+    def __init__(self, cache_dir: Optional[Path] = None, max_age: int = MAX_AGE):
+        self.cache_dir = cache_dir or self.CACHE_DIR
+        self.max_age = max_age
+    
+    def fetch_json(self, session, method: str, url: str, **kwargs):
+        """
+        Return the decoded JSON body for a request, using the cache when possible.
+        
+        Fresh entries are returned without a request; stale ones are sent as
+        conditional requests and reused on 304 Not Modified. Raises
+        requests.exceptions.HTTPError for error responses.
+        """
+        key = f"{method} {url} {json.dumps(kwargs.get('json'), sort_keys=True)}"
+        cache_path = self.cache_dir / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+        entry = self._load(cache_path)
+        
+        if entry and time.time() - entry["fetched"] < self.max_age:
+            return entry["body"]
+        
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        
+        response = session.request(method, url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry:
+            entry["fetched"] = time.time()
+            self._store(cache_path, entry)
+            return entry["body"]
+        
+        response.raise_for_status()
+        body = response.json()
+        self._store(cache_path, {
+            "fetched": time.time(),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "body": body
+        })
+        return body
+    
+    def _load(self, cache_path: Path) -> Optional[Dict]:
+        """Read a cache entry, treating unreadable entries as missing."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+    
+    def _store(self, cache_path: Path, entry: Dict):
+        """Write a cache entry atomically; caching is best-effort."""
+        tmp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            pass
+
 
 class VulnerabilityChecker:
     """Checks for known vulnerabilities in CEF versions using OSV.dev API."""
     
-    OSV_API_URL = "https://api.osv.dev/v1/query"
+    OSV_BATCH_URL = "https://api.osv.dev/v1/querybatch"
+    OSV_VULN_URL = "https://api.osv.dev/v1/vulns/{}"
+    OSV_TIMEOUT = (10, 30)  # (connect, read)
+    HYDRATE_WORKERS = 16
+    RETRY_TOTAL = 3
+    RETRY_BACKOFF = 0.5
+    RETRY_STATUSES = (429, 500, 502, 503, 504)
     
-    def __init__(self, logger):
+    def __init__(self, logger, cache_ttl: int = ResponseCache.MAX_AGE):
         self.logger = logger
+        # OSV answers younger than cache_ttl seconds are reused without a request
+        self.cache = ResponseCache(max_age=cache_ttl)
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            _import_requests()
+            # One pooled session so the batch query and every hydration
+            # request share TCP/TLS connections; transient OSV errors are
+            # retried with backoff (the queries are idempotent, so POST too)
+            retry = Retry(
+                total=self.RETRY_TOTAL,
+                backoff_factor=self.RETRY_BACKOFF,
+                status_forcelist=self.RETRY_STATUSES,
+                allowed_methods=frozenset({"GET", "POST"})
+            )
+            self.session = requests.Session()
+            self.session.mount("https://", HTTPAdapter(
+                pool_connections=self.HYDRATE_WORKERS,
+                pool_maxsize=self.HYDRATE_WORKERS,
+                max_retries=retry
+            ))
         
     def check_version(self, version: str) -> Tuple[bool, List[Dict]]:
         """
@@ -65,24 +390,31 @@ class VulnerabilityChecker:
             # Query OSV.dev for CEF vulnerabilities
             # CEF vulnerabilities might be under "chromium" or "cef" ecosystem
             queries = [
-                {"package": {"name": "chromium-embedded-framework", "ecosystem": "OSS-Fuzz"}},
-                {"package": {"name": "cef", "ecosystem": "OSS-Fuzz"}},
+                {"package": {"name": "chromium-embedded-framework", "ecosystem": "OSS-Fuzz"}, "version": version},
+                {"package": {"name": "cef", "ecosystem": "OSS-Fuzz"}, "version": version},
             ]
             
-            all_vulnerabilities = []
+            # Both queries go out in a single querybatch round trip
+            data = self.cache.fetch_json(
+                self.session, "POST", self.OSV_BATCH_URL,
+                json={"queries": queries},
+                timeout=self.OSV_TIMEOUT
+            )
             
-            for query in queries:
-                query["version"] = version
-                response = requests.post(
-                    self.OSV_API_URL,
-                    json=query,
-                    timeout=10
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    if "vulns" in data:
-                        all_vulnerabilities.extend(data["vulns"])
+            vuln_ids = []
+            for result in data.get("results", []):
+                for vuln in result.get("vulns", []):
+                    if "id" in vuln:
+                        vuln_ids.append(vuln["id"])
+            
+            # querybatch only returns IDs; fetch the full records in parallel
+            vuln_ids = list(dict.fromkeys(vuln_ids))
+            all_vulnerabilities = []
+            if vuln_ids:
+                with ThreadPoolExecutor(max_workers=min(self.HYDRATE_WORKERS, len(vuln_ids))) as executor:
+                    for vuln in executor.map(self._fetch_vulnerability, vuln_ids):
+                        if vuln:
+                            all_vulnerabilities.append(vuln)
             
             if not all_vulnerabilities:
                 self.logger.log(f"✓ No known vulnerabilities found for CEF {version}")
@@ -90,21 +422,12 @@ class VulnerabilityChecker:
                 return False, []
             
             # Analyze severity
-            critical_count = 0
-            high_count = 0
-            medium_count = 0
-            low_count = 0
-            
-            for vuln in all_vulnerabilities:
-                severity = self._get_severity(vuln)
-                if severity == "CRITICAL":
-                    critical_count += 1
-                elif severity == "HIGH":
-                    high_count += 1
-                elif severity == "MEDIUM":
-                    medium_count += 1
-                else:
-                    low_count += 1
+            severities = [self._get_severity(vuln) for vuln in all_vulnerabilities]
+            counts = Counter(severities)
+            critical_count = counts["CRITICAL"]
+            high_count = counts["HIGH"]
+            medium_count = counts["MEDIUM"]
+            low_count = len(severities) - critical_count - high_count - medium_count
             
             # Display results
             self.logger.log("=" * 70)
@@ -123,10 +446,9 @@ class VulnerabilityChecker:
             self.logger.log("\nVulnerability Details:")
             self.logger.log("-" * 70)
             
-            for vuln in all_vulnerabilities[:5]:  # Show first 5
+            for vuln, severity in zip(all_vulnerabilities[:5], severities):  # Show first 5
                 vuln_id = vuln.get("id", "Unknown")
                 summary = vuln.get("summary", "No summary available")
-                severity = self._get_severity(vuln)
                 
                 self.logger.log(f"\n  ID: {vuln_id}")
                 self.logger.log(f"  Severity: {severity}")
@@ -153,11 +475,25 @@ class VulnerabilityChecker:
             
             return has_critical, all_vulnerabilities
             
+        except requests.exceptions.Timeout as e:
+            self.logger.log(f"WARNING: Vulnerability check timed out: {e}")
+            self.logger.log("Proceeding without vulnerability check...\n")
+            return False, []
         except requests.exceptions.RequestException as e:
             self.logger.log(f"WARNING: Failed to check vulnerabilities: {e}")
             self.logger.log("Proceeding without vulnerability check...\n")
             return False, []
     
+    def _fetch_vulnerability(self, vuln_id: str) -> Optional[Dict]:
+        """Fetch the full OSV record for a vulnerability ID."""
+        try:
+            return self.cache.fetch_json(
+                self.session, "GET", self.OSV_VULN_URL.format(vuln_id),
+                timeout=self.OSV_TIMEOUT
+            )
+        except requests.exceptions.HTTPError:
+            return None
+    
     def _get_severity(self, vuln: Dict) -> str:
         """Extract severity from vulnerability data."""
         if "severity" in vuln:
@@ -184,6 +520,8 @@ class VulnerabilityChecker:
 class Logger:
     """Handles logging to both console and file."""
     
+    FLUSH_INTERVAL = 0.1  # seconds buffered lines may wait before reaching disk
+    
     def __init__(self, log_dir: Path):
         self.log_dir = log_dir
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -191,27 +529,86 @@ class Logger:
         self.commands_log = log_dir / "commands.log"
         self.jsonl_log = log_dir / "agent-run.jsonl"
         
-        # Clear existing logs
-        self.commands_log.write_text("")
-        self.jsonl_log.write_text("")
+        # Open (and clear) the logs once instead of re-opening them per message
+        self._cmd_fh = open(self.commands_log, "w", encoding="utf-8", buffering=64 * 1024)
+        self._jsonl_fh = open(self.jsonl_log, "wb", buffering=64 * 1024)
+        # The download runs in a worker thread alongside the other steps
+        self._lock = threading.Lock()
+        # Whether progress() draws, and whether its line still needs ending
+        self._show_progress = True
+        self._progress_open = False
+        
+        # Lines are written in buffered batches; a background thread flushes
+        # them periodically so the files stay current during long steps
+        self._closed = threading.Event()
+        self._flusher = threading.Thread(target=self._flush_periodically, name="cef-log-flush", daemon=True)
+        self._flusher.start()
+        atexit.register(self.close)
     
     def log(self, message: str, level: str = "INFO"):
         """Log a message to console and file."""
         timestamp = datetime.now().isoformat()
-        print(message)
-        
-        # Write to commands.log
-        with open(self.commands_log, "a", encoding="utf-8") as f:
-            f.write(f"[{timestamp}] {message}\n")
         
-        # Write to JSONL
+        # Write to JSONL; errors are flushed immediately
         log_entry = {
             "timestamp": timestamp,
             "level": level,
             "message": message
         }
-        with open(self.jsonl_log, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry) + "\n")
+        if ORJSON_AVAILABLE:
+            jsonl_line = orjson.dumps(log_entry) + b"\n"
+        else:
+            jsonl_line = json.dumps(log_entry).encode("utf-8") + b"\n"
+        
+        with self._lock:
+            self._end_progress()
+            print(message)
+            self._cmd_fh.write(f"[{timestamp}] {message}\n")
+            self._jsonl_fh.write(jsonl_line)
+            if level == "ERROR":
+                self.flush()
+    
+    def progress(self, percent: float):
+        """Redraw the console progress line (console only, never logged)."""
+        with self._lock:
+            if self._show_progress:
+                print(f"\rProgress: {percent:.1f}%", end="", flush=True)
+                self._progress_open = True
+    
+    def show_progress(self, visible: bool):
+        """Enable or suppress progress(), e.g. while other steps are printing."""
+        with self._lock:
+            self._show_progress = visible
+            if not visible:
+                self._end_progress()
+    
+    def _end_progress(self):
+        # Callers hold the lock; a message after a progress line starts on a new line
+        if self._progress_open:
+            print()
+            self._progress_open = False
+    
+    def flush(self):
+        """Write any buffered log lines to disk."""
+        for fh in (self._cmd_fh, self._jsonl_fh):
+            if not fh.closed:
+                fh.flush()
+    
+    def _flush_periodically(self):
+        while not self._closed.wait(self.FLUSH_INTERVAL):
+            with self._lock:
+                self.flush()
+    
+    def close(self):
+        """Stop the flush thread, then flush and close the log files."""
+        self._closed.set()
+        if self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            self._end_progress()
+            for fh in (self._cmd_fh, self._jsonl_fh):
+                if not fh.closed:
+                    fh.close()
     
     def log_command(self, command: str, output: str = "", returncode: int = 0):
         """Log a command execution."""
@@ -224,9 +621,32 @@ class Logger:
 class CEFDetector:
     """Detects existing CEF installations."""
     
+    # Directories that never hold an application's CEF runtime
+    SKIP_DIRS = frozenset({"node_modules", "__pycache__", "$Recycle.Bin", "WinSxS", "Temp"})
+    
+    # How deep a system-wide search descends below each common root
+    SYSTEM_SEARCH_DEPTH = 4
+    
+    # Common roots searched concurrently during a system-wide search
+    SEARCH_WORKERS = 4
+    
+    # CEF-specific files per OS
+    CEF_INDICATORS = {
+        "Windows": ["libcef.dll", "cef.pak", "chrome_elf.dll"],
+        "Darwin": ["Chromium Embedded Framework.framework", "libcef.dylib"],
+        "Linux": ["libcef.so", "cef.pak"]
+    }
+    
+    # Lines carrying version information in version.txt/README.txt/VERSION
+    VERSION_PATTERNS = (
+        ("version", re.compile(rb"^.*(?:CEF Version|cef_version).*$", re.MULTILINE)),
+        ("chromium_version", re.compile(rb"^.*(?:Chromium Version|chromium_version).*$", re.MULTILINE)),
+    )
+    
     def __init__(self, logger: Logger):
         self.logger = logger
         self.os_type = platform.system()
+        self._indicators = frozenset(self.CEF_INDICATORS.get(self.os_type, []))
     
     def detect_cef_in_path(self, app_path: Optional[str] = None) -> Dict:
         """
@@ -252,13 +672,21 @@ class CEFDetector:
             result = self._detect_in_directory(Path(app_path))
         else:
             self.logger.log("Searching for CEF installations system-wide...")
-            # Search common installation locations
+            # Search common installation locations in parallel; the first root
+            # in priority order with a hit wins and the other walks are stopped
             search_paths = self._get_common_cef_paths()
-            for path in search_paths:
-                if path.exists():
-                    detected = self._detect_in_directory(path)
+            stop = threading.Event()
+            
+            def search(path: Path) -> Dict:
+                return self._detect_in_directory(
+                    path, max_depth=self.SYSTEM_SEARCH_DEPTH, same_device=True, stop=stop
+                )
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(self.SEARCH_WORKERS, len(search_paths)))) as executor:
+                for detected in executor.map(search, search_paths):
                     if detected["found"]:
                         result = detected
+                        stop.set()
                         break
         
         if result["found"]:
@@ -273,8 +701,17 @@ class CEFDetector:
         self.logger.log("=" * 70 + "\n")
         return result
     
-    def _detect_in_directory(self, directory: Path) -> Dict:
-        """Detect CEF in a specific directory."""
+    def _detect_in_directory(self, directory: Path, max_depth: Optional[int] = None,
+                             same_device: bool = False, stop: Optional[threading.Event] = None) -> Dict:
+        """
+        Detect CEF in a specific directory.
+        
+        Args:
+            directory: Root of the search
+            max_depth: Deepest subdirectory level to search (None for no limit)
+            same_device: Do not descend into other mounted filesystems
+            stop: Event that abandons the search once set
+        """
         result = {
             "found": False,
             "version": None,
@@ -283,30 +720,56 @@ class CEFDetector:
             "chromium_version": None
         }
         
-        # Look for CEF-specific files
-        cef_indicators = {
-            "Windows": ["libcef.dll", "cef.pak", "chrome_elf.dll"],
-            "Darwin": ["Chromium Embedded Framework.framework", "libcef.dylib"],
-            "Linux": ["libcef.so", "cef.pak"]
-        }
-        
-        indicators = cef_indicators.get(self.os_type, [])
-        
-        for root, dirs, files in os.walk(directory):
-            for indicator in indicators:
-                if indicator in files or indicator in dirs:
-                    result["found"] = True
-                    result["paths"].append(Path(root))
-                    
-                    # Try to extract version information
-                    version_info = self._extract_version_info(Path(root))
-                    if version_info:
-                        result.update(version_info)
-                    
-                    break
-            
-            if result["found"]:
+        # Breadth-first scandir walk: entry names and types come straight from
+        # the directory listing, and the search stops at the first hit.
+        # Symlinks are never entered; hidden and known-noise directories are
+        # only skipped in the system-wide (depth-limited) search, since an
+        # explicit path may well live under one of them.
+        prune_names = max_depth is not None
+        root_device = None
+        if same_device:
+            try:
+                root_device = directory.stat().st_dev
+            except OSError:
+                return result
+        
+        queue = deque([(directory, 0)])
+        while queue:
+            if stop is not None and stop.is_set():
                 break
+            current, depth = queue.popleft()
+            current = Path(current)
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            if not self._indicators.isdisjoint(entry.name for entry in entries):
+                result["found"] = True
+                result["paths"].append(current)
+                
+                # Try to extract version information
+                version_info = self._extract_version_info(current)
+                if version_info:
+                    result.update(version_info)
+                
+                break
+            
+            if max_depth is not None and depth >= max_depth:
+                continue
+            
+            for entry in entries:
+                if prune_names and (entry.name.startswith(".") or entry.name in self.SKIP_DIRS):
+                    continue
+                try:
+                    if not entry.is_dir(follow_symlinks=False):
+                        continue
+                    if root_device is not None and os.lstat(entry.path).st_dev != root_device:
+                        continue
+                except OSError:
+                    continue
+                queue.append((entry.path, depth + 1))
         
         return result
     
@@ -317,21 +780,21 @@ class CEFDetector:
         # Look for version.txt or README.txt
         for version_file in ["version.txt", "README.txt", "VERSION"]:
             version_path = cef_path / version_file
-            if version_path.exists():
-                try:
-                    content = version_path.read_text(encoding="utf-8", errors="ignore")
-                    # Parse version information
-                    for line in content.split("\n"):
-                        if "CEF Version" in line or "cef_version" in line:
-                            parts = line.split(":")
-                            if len(parts) > 1:
-                                version_info["version"] = parts[1].strip()
-                        if "Chromium Version" in line or "chromium_version" in line:
-                            parts = line.split(":")
-                            if len(parts) > 1:
-                                version_info["chromium_version"] = parts[1].strip()
-                except Exception as e:
-                    self.logger.log(f"Warning: Could not read {version_file}: {e}")
+            try:
+                with open(version_path, "rb") as f:
+                    if os.fstat(f.fileno()).st_size == 0:
+                        continue
+                    # Scan the raw bytes in place; only matching lines are decoded
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        for key, pattern in self.VERSION_PATTERNS:
+                            for match in pattern.finditer(mm):
+                                parts = match.group().split(b":")
+                                if len(parts) > 1:
+                                    version_info[key] = parts[1].strip().decode("utf-8", errors="ignore")
+            except FileNotFoundError:
+                continue
+            except Exception as e:
+                self.logger.log(f"Warning: Could not read {version_file}: {e}")
         
         # Try to determine architecture
         if self.os_type == "Windows":
@@ -354,10 +817,10 @@ class CEFDetector:
         if self.os_type == "Windows":
             paths = [
                 Path("C:/Program Files"),
-                Path("C:/Program Files (x86)"),
-                Path(os.environ.get("LOCALAPPDATA", "")),
-                Path(os.environ.get("APPDATA", ""))
+                Path("C:/Program Files (x86)")
             ]
+            # An unset variable must not turn into a search of the current directory
+            paths += [Path(os.environ[var]) for var in ("LOCALAPPDATA", "APPDATA") if os.environ.get(var)]
         elif self.os_type == "Darwin":
             paths = [
                 Path("/Applications"),
@@ -379,60 +842,256 @@ class CEFDetector:
 class CEFBackup:
     """Handles backup of existing CEF installations."""
     
-    def __init__(self, logger: Logger, backup_dir: Path):
+    def __init__(self, logger: Logger, backup_dir: Path, snapshot: bool = False):
         self.logger = logger
         self.backup_dir = backup_dir
+        # Copy the files into a directory (reflinked where the filesystem
+        # supports it) instead of writing a compressed archive
+        self.snapshot = snapshot
         self.backup_dir.mkdir(parents=True, exist_ok=True)
     
-    def create_backup(self, cef_paths: List[Path], dry_run: bool = False) -> Optional[Path]:
-        """Create a backup of CEF files."""
+    def create_backup(self, cef_paths: List[Path], dry_run: bool = False) -> Tuple[Optional[Path], int]:
+        """
+        Create a backup of CEF files.
+        
+        Returns:
+            Tuple of (backup_path, size_in_bytes); the path is None on failure
+        """
         if not cef_paths:
             self.logger.log("No CEF paths to backup")
-            return None
+            return None, 0
         
         self.logger.log("=" * 70)
         self.logger.log("Creating Backup")
         self.logger.log("=" * 70)
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        backup_name = f"cef_backup_{timestamp}.tar.gz"
+        use_zstd = ZSTANDARD_AVAILABLE or bool(shutil.which("zstd") and shutil.which("tar"))
+        if self.snapshot:
+            backup_name = f"cef_backup_{timestamp}"
+        else:
+            backup_name = f"cef_backup_{timestamp}.tar.{'zst' if use_zstd else 'gz'}"
         backup_path = self.backup_dir / backup_name
         
         if dry_run:
             self.logger.log(f"[DRY RUN] Would create backup: {backup_path}")
             self.logger.log(f"[DRY RUN] Would backup paths: {', '.join(str(p) for p in cef_paths)}")
             self.logger.log("=" * 70 + "\n")
-            return backup_path
+            return backup_path, 0
         
         try:
-            with tarfile.open(backup_path, "w:gz") as tar:
-                for path in cef_paths:
-                    if path.exists():
-                        self.logger.log(f"Backing up: {path}")
+            paths = [path for path in cef_paths if path.exists()]
+            for path in paths:
+                self.logger.log(f"Backing up: {path}")
+            
+            if self.snapshot:
+                size = self._snapshot_backup(paths, backup_path)
+                self.logger.log(f"\n✓ Snapshot created: {backup_path}")
+                self.logger.log(f"  Size: {size / (1024 * 1024):.2f} MB")
+                self.logger.log("=" * 70 + "\n")
+                return backup_path, size
+            
+            created = False
+            if use_zstd:
+                created = (self._native_backup(paths, backup_path, ["zstd", f"-{_ZSTD_LEVEL}", "-T0", "-q", "-c"]) or
+                           self._zstandard_backup(paths, backup_path))
+                if not created:
+                    if backup_path.exists():
+                        backup_path.unlink()
+                    backup_path = backup_path.with_suffix(".gz")
+            
+            if not created:
+                gzip_tool = "pigz" if shutil.which("pigz") else "gzip"
+                created = (self._native_backup(paths, backup_path, [gzip_tool, f"-{_BACKUP_COMPRESSLEVEL}"]) or
+                           self._pigz_backup(paths, backup_path))
+            
+            if not created:
+                with tarfile.open(backup_path, "w:gz", compresslevel=_BACKUP_COMPRESSLEVEL, copybufsize=_TAR_BUFSIZE) as tar:
+                    for path in paths:
                         tar.add(path, arcname=path.name)
             
-            size_mb = backup_path.stat().st_size / (1024 * 1024)
+            size = backup_path.stat().st_size
             self.logger.log(f"\n✓ Backup created: {backup_path}")
-            self.logger.log(f"  Size: {size_mb:.2f} MB")
+            self.logger.log(f"  Size: {size / (1024 * 1024):.2f} MB")
             self.logger.log("=" * 70 + "\n")
             
-            return backup_path
+            return backup_path, size
             
         except Exception as e:
             self.logger.log(f"✗ Backup failed: {e}", level="ERROR")
             self.logger.log("=" * 70 + "\n")
-            return None
-
+            return None, 0
+    
+    def _snapshot_backup(self, paths: List[Path], backup_path: Path) -> int:
+        """
+        Mirror each path into backup_path/<name> with _clone_file.
+        
+        Returns:
+            Total size of the copied files in bytes
+        """
+        backup_path.mkdir(parents=True)
+        total = 0
+        for path in paths:
+            dest = backup_path / path.name
+            if not path.is_dir():
+                total += _clone_file(str(path), str(dest))
+                continue
+            
+            for root, dirs, files in os.walk(path):
+                target = dest / os.path.relpath(root, path)
+                target.mkdir(exist_ok=True)
+                # os.walk lists symlinked directories without descending into them
+                for name in dirs:
+                    src = os.path.join(root, name)
+                    if os.path.islink(src):
+                        os.symlink(os.readlink(src), os.path.join(target, name))
+                for name in files:
+                    src = os.path.join(root, name)
+                    dst = os.path.join(target, name)
+                    if os.path.islink(src):
+                        os.symlink(os.readlink(src), dst)
+                    else:
+                        total += _clone_file(src, dst)
+                shutil.copystat(root, target)
+        
+        return total
+    
+    def _native_backup(self, paths: List[Path], backup_path: Path, compress_cmd: List[str]) -> bool:
+        """
+        Create the backup with native tar piped into a compressor command
+        (pigz, gzip or zstd) reading stdin and writing stdout.
+        
+        Returns False when the tools are missing or fail, so the caller can
+        fall back to another method.
+        """
+        tar_exe = shutil.which("tar")
+        compress_exe = shutil.which(compress_cmd[0])
+        if not tar_exe or not compress_exe:
+            return False
+        
+        # Each path is archived under its own name, like tar.add(arcname=path.name)
+        tar_cmd = [tar_exe, "-cf", "-"]
+        for path in paths:
+            path = path.resolve()
+            tar_cmd += ["-C", str(path.parent), path.name]
+        
+        with open(backup_path, "wb") as out:
+            tar_proc = subprocess.Popen(tar_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            compress_cmd = [compress_exe] + compress_cmd[1:]
+            compress_proc = subprocess.Popen(compress_cmd, stdin=tar_proc.stdout, stdout=out, stderr=subprocess.PIPE)
+            tar_proc.stdout.close()  # the compressor owns the pipe now
+            _, tar_err = tar_proc.communicate()
+            _, compress_err = compress_proc.communicate()
+        
+        if tar_proc.returncode != 0 or compress_proc.returncode != 0:
+            self.logger.log_command(
+                " ".join(tar_cmd + ["|"] + compress_cmd),
+                (tar_err + compress_err).decode(errors="replace").strip(),
+                tar_proc.returncode or compress_proc.returncode
+            )
+            self.logger.log("Native tar backup failed, falling back to tarfile")
+            return False
+        
+        return True
+    
+    def _zstandard_backup(self, paths: List[Path], backup_path: Path) -> bool:
+        """
+        Stream a tarfile archive through the zstandard module's multithreaded
+        compressor. Returns False when the module is not installed.
+        """
+        if not ZSTANDARD_AVAILABLE:
+            return False
+        
+        cctx = zstandard.ZstdCompressor(level=_ZSTD_LEVEL, threads=-1)
+        with open(backup_path, "wb") as raw, cctx.stream_writer(raw) as compressor:
+            with tarfile.open(fileobj=compressor, mode="w|", bufsize=_TAR_BUFSIZE // 2, copybufsize=_TAR_BUFSIZE) as tar:
+                for path in paths:
+                    tar.add(path, arcname=path.name)
+        
+        return True
+    
+    def _pigz_backup(self, paths: List[Path], backup_path: Path) -> bool:
+        """
+        Stream a tarfile archive into pigz (for systems without native tar).
+        
+        Returns False when pigz is missing or fails.
+        """
+        pigz_exe = shutil.which("pigz")
+        if not pigz_exe:
+            return False
+        
+        cmd = [pigz_exe, f"-{_BACKUP_COMPRESSLEVEL}"]
+        with open(backup_path, "wb") as out:
+            proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=out, stderr=subprocess.PIPE)
+            error = None
+            try:
+                # 1MB-aligned writes match pigz's default compression block size
+                with tarfile.open(fileobj=proc.stdin, mode="w|", bufsize=_TAR_BUFSIZE // 2, copybufsize=_TAR_BUFSIZE) as tar:
+                    for path in paths:
+                        tar.add(path, arcname=path.name)
+            except BrokenPipeError as e:
+                error = e
+            finally:
+                try:
+                    proc.stdin.close()
+                except BrokenPipeError:
+                    pass
+                stderr = proc.stderr.read()
+                proc.stderr.close()
+                proc.wait()
+        
+        if error or proc.returncode != 0:
+            self.logger.log_command(" ".join(cmd), stderr.decode(errors="replace").strip() or str(error), proc.returncode)
+            self.logger.log("pigz backup failed, falling back to tarfile")
+            return False
+        
+        return True
 
 class CEFDownloader:
     """Downloads CEF binaries from official sources."""
     
     CEF_DOWNLOAD_BASE = "https://cef-builds.spotifycdn.com"
     CEF_INDEX_URL = "https://cef-builds.spotifycdn.com/index.json"
+    READ_CHUNK_SIZE = 1024 * 1024
+    RANGE_CHUNK_SIZE = 16 * 1024 * 1024
+    RANGE_WORKERS = 8
     
-    def __init__(self, logger: Logger):
+    def __init__(self, logger: Logger, parallelism: int = RANGE_WORKERS):
         self.logger = logger
         self.os_type = platform.system()
+        # Concurrent byte-range connections used by download_cef (1 disables ranges)
+        self.parallelism = max(1, parallelism)
+        self.cache = ResponseCache()
+        # Published SHA-1 checksums by download URL, filled from the builds index
+        self.checksums: Dict[str, str] = {}
+        # Resolved download URLs by (version, platform, architecture)
+        self._urls: Dict[Tuple[str, str, str], str] = {}
+        # Set by cancel() to stop an in-flight download from another thread
+        self.cancelled = threading.Event()
+        # 'download' or 'extraction' after download_and_extract() fails
+        self.failed_stage: Optional[str] = None
+        # Builds index, fetched at most once
+        self._builds = None
+        self._builds_lock = threading.Lock()
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            _import_requests()
+            self.session = requests.Session()
+            self.session.mount("https://", HTTPAdapter(
+                pool_connections=self.parallelism,
+                pool_maxsize=self.parallelism
+            ))
+    
+    def _load_index(self) -> Dict:
+        """Fetch the CEF builds index, at most once per downloader."""
+        with self._builds_lock:
+            if self._builds is None:
+                self._builds = self.cache.fetch_json(self.session, "GET", self.CEF_INDEX_URL, timeout=(10, 30))
+            return self._builds
+    
+    def cancel(self):
+        """Ask an in-flight download (running in another thread) to stop."""
+        self.cancelled.set()
     
     def get_download_url(self, version: str, platform_name: str = None, architecture: str = None) -> Optional[str]:
         """
@@ -465,14 +1124,15 @@ class CEFDownloader:
             }
             architecture = arch_map.get(platform.machine(), "64")
         
+        key = (version, platform_name, architecture)
+        if key in self._urls:
+            return self._urls[key]
+        
         self.logger.log(f"Searching for CEF {version} for {platform_name} {architecture}...")
         
         try:
             # Fetch the CEF builds index
-            response = requests.get(self.CEF_INDEX_URL, timeout=30)
-            response.raise_for_status()
-            
-            builds = response.json()
+            builds = self._load_index()
             
             # Search for matching build
             for build_type in ["stable", "beta", "dev"]:
@@ -483,7 +1143,11 @@ class CEFDownloader:
                             for file_info in files:
                                 if (platform_name in file_info.get("platform", "") and
                                     architecture in file_info.get("name", "")):
-                                    return file_info.get("url", "")
+                                    url = file_info.get("url", "")
+                                    if file_info.get("sha1"):
+                                        self.checksums[url] = file_info["sha1"].lower()
+                                    self._urls[key] = url
+                                    return url
             
             # If exact version not found, try to construct URL
             # Format: cef_binary_{version}_{platform}{arch}_minimal.tar.bz2
@@ -493,12 +1157,156 @@ class CEFDownloader:
             )
             
             self.logger.log(f"Exact match not found, trying: {constructed_url}")
+            self._urls[key] = constructed_url
             return constructed_url
             
         except Exception as e:
             self.logger.log(f"Error fetching CEF builds index: {e}")
             return None
     
+    def download_and_extract(self, version: str, extract_dir: Path, dry_run: bool = False) -> Optional[str]:
+        """
+        Download CEF and extract it as it arrives.
+        
+        Tar archives are decompressed and unpacked straight from the HTTP
+        stream, so no archive file is written; zip archives need their
+        central directory and are downloaded next to extract_dir first.
+        
+        Returns:
+            The download URL on success, None on failure (see failed_stage)
+        """
+        self.logger.log("=" * 70)
+        self.logger.log("Downloading and Extracting CEF")
+        self.logger.log("=" * 70)
+        
+        self.failed_stage = "download"
+        download_url = self.get_download_url(version)
+        
+        if not download_url:
+            self.logger.log("✗ Could not determine download URL")
+            self.logger.log("=" * 70 + "\n")
+            return None
+        
+        self.logger.log(f"Download URL: {download_url}")
+        
+        if dry_run:
+            self.logger.log(f"[DRY RUN] Would download and extract to: {extract_dir}")
+            self.logger.log("=" * 70 + "\n")
+            return download_url
+        
+        filename = download_url.split("/")[-1]
+        expected_sha1 = self.checksums.get(download_url)
+        stream = None
+        
+        try:
+            self.logger.log(f"Extracting to: {extract_dir}")
+            extract_dir.mkdir(parents=True, exist_ok=True)
+            
+            if filename.endswith(".zip"):
+                archive_path = extract_dir.parent / filename
+                sha1 = self._download_stream(download_url, archive_path)
+                size = archive_path.stat().st_size
+                self.failed_stage = "extraction"
+                with zipfile.ZipFile(archive_path, 'r') as zip_ref:
+                    zip_ref.extractall(extract_dir)
+                archive_path.unlink()
+            else:
+                response = self.session.get(download_url, stream=True, timeout=(10, 300))
+                response.raise_for_status()
+                with _PrefetchStream(response, self.READ_CHUNK_SIZE, cancel=self.cancelled,
+                                     progress=self.logger.progress) as stream:
+                    self._extract_stream(stream, extract_dir, Path(filename).suffix)
+                    # Drain trailing padding so the digest covers the whole archive
+                    while stream.read(_TAR_BUFSIZE):
+                        pass
+                    sha1 = stream.sha1.hexdigest()
+                    size = stream.bytes_read
+            
+            if expected_sha1:
+                if sha1 != expected_sha1:
+                    self.failed_stage = "download"
+                    shutil.rmtree(extract_dir, ignore_errors=True)
+                    self.logger.log(f"✗ Checksum mismatch: expected SHA-1 {expected_sha1}, got {sha1}", level="ERROR")
+                    self.logger.log("=" * 70 + "\n")
+                    return None
+                self.logger.log(f"✓ SHA-1 verified: {sha1}")
+            
+            self.failed_stage = None
+            self.logger.log(f"✓ Downloaded and extracted to: {extract_dir}")
+            self.logger.log(f"  Size: {size / (1024*1024):.2f} MB")
+            self.logger.log("=" * 70 + "\n")
+            
+            return download_url
+            
+        except Exception as e:
+            # The streamed tar is read and unpacked together; blame the
+            # extraction unless the connection itself failed or was cancelled
+            if stream is not None and stream.error is None and not self.cancelled.is_set():
+                self.failed_stage = "extraction"
+            self.logger.log(f"✗ Download or extraction failed: {e}", level="ERROR")
+            self.logger.log("=" * 70 + "\n")
+            return None
+    
+    def _extract_stream(self, stream: io.RawIOBase, extract_dir: Path, suffix: str):
+        """
+        Unpack a streamed tarball into extract_dir.
+        
+        When a parallel decompressor (pbzip2, lbzip2, pigz) is installed the
+        stream is piped through it from a feeder thread, so Python only
+        unpacks tar members; otherwise tarfile decompresses in-process.
+        """
+        tools = CEFInstaller.PARALLEL_DECOMPRESSORS.get(suffix, [])
+        tool = next((path for path in map(shutil.which, tools) if path), None)
+        if not tool:
+            with tarfile.open(fileobj=stream, mode="r|*", bufsize=_TAR_BUFSIZE, copybufsize=_TAR_BUFSIZE) as tar_ref:
+                _extract_tar(tar_ref, extract_dir)
+            return
+        
+        proc = subprocess.Popen([tool, "-dc"], stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        feed_errors = []
+        
+        def feed():
+            try:
+                shutil.copyfileobj(stream, proc.stdin, _TAR_BUFSIZE)
+            except Exception as e:
+                feed_errors.append(e)
+            finally:
+                try:
+                    proc.stdin.close()
+                except OSError:
+                    pass
+        
+        feeder = threading.Thread(target=feed, name="cef-decompress-feed", daemon=True)
+        feeder.start()
+        error = None
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode="r|", bufsize=_TAR_BUFSIZE, copybufsize=_TAR_BUFSIZE) as tar_ref:
+                _extract_tar(tar_ref, extract_dir)
+            # Drain trailing padding so the decompressor exits cleanly
+            while proc.stdout.read(_TAR_BUFSIZE):
+                pass
+        except Exception as e:
+            error = e
+        finally:
+            # Closing stdout stops the decompressor, which in turn ends the feeder
+            proc.stdout.close()
+            feeder.join()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            proc.wait()
+        
+        # A failed or cancelled download explains everything downstream; a
+        # broken pipe only means the tar side had already stopped
+        if feed_errors and not isinstance(feed_errors[0], BrokenPipeError):
+            raise feed_errors[0]
+        # A negative code is the signal from closing its stdout after a tar error
+        if proc.returncode > 0 or (proc.returncode and not error):
+            raise tarfile.TarError(
+                f"{Path(tool).name} exited with code {proc.returncode}: {stderr.decode(errors='replace').strip()}"
+            )
+        if error:
+            raise error
+    
     def download_cef(self, version: str, download_dir: Path, dry_run: bool = False) -> Optional[Path]:
         """Download CEF binary distribution."""
         self.logger.log("=" * 70)
@@ -516,6 +1324,9 @@ class CEFDownloader:
         
         filename = download_url.split("/")[-1]
         download_path = download_dir / filename
+        # Data lands in a .part file that is renamed only once it checks out,
+        # so an interrupted download never looks like a complete archive
+        part_path = download_dir / (filename + ".part")
         
         if dry_run:
             self.logger.log(f"[DRY RUN] Would download to: {download_path}")
@@ -525,38 +1336,189 @@ class CEFDownloader:
         try:
             self.logger.log(f"Downloading to: {download_path}")
             
-            response = requests.get(download_url, stream=True, timeout=300)
-            response.raise_for_status()
+            # Large archives are fetched as parallel byte ranges when the
+            # server advertises support; otherwise fall back to one stream
+            head = self.session.head(download_url, allow_redirects=True, timeout=(10, 30))
+            total_size = int(head.headers.get("Content-Length", 0))
+            ranged = (
+                self.parallelism > 1 and
+                head.status_code == 200 and
+                total_size > self.RANGE_CHUNK_SIZE and
+                head.headers.get("Accept-Ranges", "").lower() == "bytes"
+            )
+            
+            expected_sha1 = self.checksums.get(download_url)
+            
+            # Reuse an archive left by an earlier run when it is complete
+            if self._is_complete(download_path, total_size, expected_sha1):
+                self.logger.log(f"✓ Already downloaded: {download_path}")
+                self.logger.log("=" * 70 + "\n")
+                return download_path
             
-            total_size = int(response.headers.get('content-length', 0))
+            # The single-stream path hashes while downloading; ranged downloads
+            # arrive out of order and are hashed afterwards
+            sha1 = None
+            if not ranged or not self._download_ranges(download_url, part_path, total_size):
+                sha1 = self._download_stream(download_url, part_path)
             
-            with open(download_path, 'wb') as f:
-                downloaded = 0
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded += len(chunk)
-                        if total_size > 0:
-                            progress = (downloaded / total_size) * 100
-                            print(f"\rProgress: {progress:.1f}%", end="", flush=True)
+            size = part_path.stat().st_size
+            if total_size and size != total_size:
+                part_path.unlink()
+                self.logger.log(f"✗ Incomplete download: expected {total_size} bytes, got {size}", level="ERROR")
+                self.logger.log("=" * 70 + "\n")
+                return None
             
-            print()  # New line after progress
+            if expected_sha1:
+                sha1 = sha1 or _file_digest(part_path, "sha1")
+                if sha1 != expected_sha1:
+                    part_path.unlink()
+                    self.logger.log(f"✗ Checksum mismatch: expected SHA-1 {expected_sha1}, got {sha1}", level="ERROR")
+                    self.logger.log("=" * 70 + "\n")
+                    return None
+                self.logger.log(f"✓ SHA-1 verified: {sha1}")
             
+            os.replace(part_path, download_path)
             self.logger.log(f"✓ Download complete: {download_path}")
-            self.logger.log(f"  Size: {download_path.stat().st_size / (1024*1024):.2f} MB")
+            self.logger.log(f"  Size: {size / (1024*1024):.2f} MB")
             self.logger.log("=" * 70 + "\n")
             
             return download_path
             
         except Exception as e:
+            if part_path.exists():
+                part_path.unlink()
             self.logger.log(f"✗ Download failed: {e}", level="ERROR")
             self.logger.log("=" * 70 + "\n")
             return None
+    
+    def _is_complete(self, download_path: Path, expected_size: int, expected_sha1: Optional[str]) -> bool:
+        """Check whether an existing file matches the server's size and published checksum."""
+        try:
+            size = download_path.stat().st_size
+        except OSError:
+            return False
+        if not expected_size or size != expected_size:
+            return False
+        return not expected_sha1 or _file_digest(download_path, "sha1") == expected_sha1
+    
+    def _download_stream(self, download_url: str, download_path: Path) -> str:
+        """
+        Download a file over a single streamed connection.
+        
+        Returns:
+            SHA-1 hex digest of the downloaded data
+        """
+        response = self.session.get(download_url, stream=True, timeout=(10, 300))
+        response.raise_for_status()
+        
+        total_size = int(response.headers.get('content-length', 0))
+        sha1 = hashlib.sha1()
+        
+        with open(download_path, 'wb') as f:
+            if total_size > 0:
+                _preallocate(f, total_size)
+            downloaded = 0
+            for chunk in response.iter_content(chunk_size=self.READ_CHUNK_SIZE):
+                if self.cancelled.is_set():
+                    raise RuntimeError("Download cancelled")
+                if chunk:
+                    f.write(chunk)
+                    sha1.update(chunk)
+                    downloaded += len(chunk)
+                    if total_size > 0:
+                        self.logger.progress((downloaded / total_size) * 100)
+            # Drop any preallocated space the server did not fill
+            f.truncate(downloaded)
+        
+        return sha1.hexdigest()
+    
+    def _download_ranges(self, download_url: str, download_path: Path, total_size: int) -> bool:
+        """
+        Download a file as concurrent byte ranges into a preallocated file.
+        
+        Returns False if the server ignores Range requests.
+        """
+        with open(download_path, 'wb') as f:
+            _preallocate(f, total_size)
+        
+        ranges = [
+            (start, min(start + self.RANGE_CHUNK_SIZE, total_size) - 1)
+            for start in range(0, total_size, self.RANGE_CHUNK_SIZE)
+        ]
+        
+        # Set when one range fails so queued ranges are dropped and running
+        # ones stop at their next chunk instead of finishing the download
+        stop = threading.Event()
+        downloaded = 0
+        with ThreadPoolExecutor(max_workers=self.parallelism) as executor:
+            futures = [
+                executor.submit(self._fetch_range, download_url, download_path, start, end, stop)
+                for start, end in ranges
+            ]
+            for future in as_completed(futures):
+                complete = False
+                try:
+                    complete = future.result()
+                finally:
+                    if not complete:
+                        stop.set()
+                        for pending in futures:
+                            pending.cancel()
+                if not complete:
+                    return False
+                downloaded += self.RANGE_CHUNK_SIZE
+                self.logger.progress(min(downloaded / total_size, 1.0) * 100)
+        
+        return True
+    
+    def _fetch_range(self, download_url: str, download_path: Path, start: int, end: int,
+                     stop: threading.Event) -> bool:
+        """
+        Fetch bytes start..end (inclusive) and write them at their offset.
+        
+        Returns False if the server ignores the range, sends a short body,
+        or another range has already failed (stop is set).
+        """
+        if stop.is_set():
+            return False
+        response = self.session.get(
+            download_url,
+            headers={"Range": f"bytes={start}-{end}"},
+            stream=True,
+            timeout=(10, 300)
+        )
+        with response:
+            if response.status_code != 206:
+                return False
+            response.raise_for_status()
+            written = 0
+            with open(download_path, 'r+b') as f:
+                f.seek(start)
+                for chunk in response.iter_content(chunk_size=self.READ_CHUNK_SIZE):
+                    if self.cancelled.is_set():
+                        raise RuntimeError("Download cancelled")
+                    if stop.is_set():
+                        return False
+                    f.write(chunk)
+                    written += len(chunk)
+        return written == end - start + 1
 
 
 class CEFInstaller:
     """Handles CEF installation and upgrade."""
     
+    CEF_LIBRARIES = frozenset({"libcef.dll", "libcef.so", "libcef.dylib"})
+    BUILD_SUBDIRS = frozenset({"Release", "Debug", "Resources"})
+    
+    # Multi-threaded decompressors tried before tarfile's in-process codecs
+    PARALLEL_DECOMPRESSORS = {
+        ".gz": ["pigz"],
+        ".bz2": ["pbzip2", "lbzip2"],
+    }
+    
+    # Records the SHA-1 of the archive an installation was made from
+    INSTALL_MARKER = ".cef_archive_sha1"
+    
     def __init__(self, logger: Logger):
         self.logger = logger
         self.os_type = platform.system()
@@ -579,8 +1541,11 @@ class CEFInstaller:
                 with zipfile.ZipFile(archive_path, 'r') as zip_ref:
                     zip_ref.extractall(extract_dir)
             elif archive_path.suffix in [".bz2", ".gz", ".tar"]:
-                with tarfile.open(archive_path, 'r:*') as tar_ref:
-                    tar_ref.extractall(extract_dir)
+                if not self._native_extract(archive_path, extract_dir):
+                    # Streaming mode reads members in order without seeking back
+                    with open(archive_path, "rb") as f:
+                        with tarfile.open(fileobj=f, mode="r|*", bufsize=_TAR_BUFSIZE, copybufsize=_TAR_BUFSIZE) as tar_ref:
+                            _extract_tar(tar_ref, extract_dir)
             else:
                 self.logger.log(f"✗ Unsupported archive format: {archive_path.suffix}")
                 return False
@@ -594,8 +1559,57 @@ class CEFInstaller:
             self.logger.log("=" * 70 + "\n")
             return False
     
-    def install_cef(self, source_dir: Path, target_dir: Path, dry_run: bool = False) -> bool:
-        """Install CEF to target directory."""
+    def _native_extract(self, archive_path: Path, extract_dir: Path) -> bool:
+        """
+        Extract a compressed tarball by streaming it through a parallel
+        decompressor, so Python only unpacks tar members.
+        
+        Returns False when no suitable tool is installed or it fails.
+        """
+        tools = self.PARALLEL_DECOMPRESSORS.get(archive_path.suffix, [])
+        tool = next((path for path in map(shutil.which, tools) if path), None)
+        if not tool:
+            return False
+        
+        cmd = [tool, "-dc", str(archive_path)]
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        error = None
+        try:
+            with tarfile.open(fileobj=proc.stdout, mode="r|", bufsize=_TAR_BUFSIZE, copybufsize=_TAR_BUFSIZE) as tar_ref:
+                _extract_tar(tar_ref, extract_dir)
+            # Drain trailing padding so the decompressor exits cleanly
+            while proc.stdout.read(_TAR_BUFSIZE):
+                pass
+        except tarfile.TarError as e:
+            error = e
+        finally:
+            proc.stdout.close()
+            stderr = proc.stderr.read()
+            proc.stderr.close()
+            proc.wait()
+        
+        if error or proc.returncode != 0:
+            self.logger.log_command(" ".join(cmd), stderr.decode(errors="replace").strip() or str(error), proc.returncode)
+            self.logger.log("Native extraction failed, falling back to tarfile")
+            return False
+        
+        return True
+    
+    def is_installed(self, target_dir: Path, sha1: str) -> bool:
+        """Check whether target_dir holds an install of the archive with this SHA-1."""
+        try:
+            return (target_dir / self.INSTALL_MARKER).read_text(encoding="utf-8").strip() == sha1
+        except OSError:
+            return False
+    
+    def install_cef(self, source_dir: Path, target_dir: Path, dry_run: bool = False,
+                    sha1: Optional[str] = None) -> bool:
+        """
+        Install CEF to target directory.
+        
+        When the archive's SHA-1 is given it is recorded in the installation,
+        so is_installed() can recognise the same build on later runs.
+        """
         self.logger.log("=" * 70)
         self.logger.log("Installing CEF")
         self.logger.log("=" * 70)
@@ -621,7 +1635,14 @@ class CEFInstaller:
                 self.logger.log("Removing existing installation...")
                 shutil.rmtree(target_dir)
             
-            shutil.copytree(cef_dir, target_dir)
+            # The extracted tree is only staging, so on the same filesystem it
+            # is moved into place; otherwise it is cloned or copied (_clone_file
+            # reflinks or copies in the kernel, else uses a 1MB buffer)
+            if not self._move_tree(cef_dir, target_dir) and not self._clone_tree(cef_dir, target_dir):
+                shutil.copytree(cef_dir, target_dir, copy_function=_clone_file)
+            
+            if sha1:
+                (target_dir / self.INSTALL_MARKER).write_text(sha1 + "\n", encoding="utf-8")
             
             self.logger.log(f"✓ CEF installed successfully")
             self.logger.log("=" * 70 + "\n")
@@ -632,19 +1653,63 @@ class CEFInstaller:
             self.logger.log("=" * 70 + "\n")
             return False
     
+    def _move_tree(self, source: Path, target: Path) -> bool:
+        """
+        Rename source to target, which is instant within one filesystem.
+        
+        Returns False when they are on different filesystems (or the rename
+        fails otherwise), leaving source in place.
+        """
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.rename(source, target)
+        except OSError:
+            return False
+        self.logger.log("Moved extracted files into place")
+        return True
+    
+    def _clone_tree(self, source: Path, target: Path) -> bool:
+        """
+        Copy a tree with cp so copy-on-write filesystems (btrfs, XFS, APFS)
+        can clone files instead of copying their data.
+        
+        Returns False when cp is unavailable or fails, leaving no target behind.
+        """
+        if self.os_type == "Linux":
+            cmd = ["cp", "--reflink=auto", "-a", f"{source}/.", str(target)]
+        elif self.os_type == "Darwin":
+            cmd = ["cp", "-Rpc", f"{source}/.", str(target)]
+        else:
+            return False
+        
+        if not shutil.which("cp"):
+            return False
+        
+        target.mkdir(parents=True)
+        result = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, universal_newlines=True)
+        if result.returncode != 0:
+            self.logger.log_command(" ".join(cmd), result.stderr.strip(), result.returncode)
+            shutil.rmtree(target, ignore_errors=True)
+            return False
+        
+        return True
+    
     def _find_cef_directory(self, search_dir: Path) -> Optional[Path]:
         """Find the CEF directory in extracted files."""
         # Look for directories containing CEF indicators
         for root, dirs, files in os.walk(search_dir):
-            if any(f in files for f in ["libcef.dll", "libcef.so", "libcef.dylib"]):
+            if not self.CEF_LIBRARIES.isdisjoint(files):
                 return Path(root)
             
-            # Check for Release or Debug directories
-            for subdir in ["Release", "Debug", "Resources"]:
-                if subdir in dirs:
-                    potential_path = Path(root) / subdir
-                    if any((potential_path / f).exists() for f in ["libcef.dll", "libcef.so", "libcef.dylib"]):
-                        return Path(root)
+            # Check for Release or Debug directories with one listing each
+            # rather than a stat per candidate library
+            for subdir in self.BUILD_SUBDIRS.intersection(dirs):
+                try:
+                    sub_files = os.listdir(os.path.join(root, subdir))
+                except OSError:
+                    continue
+                if not self.CEF_LIBRARIES.isdisjoint(sub_files):
+                    return Path(root)
         
         return None
 
@@ -670,16 +1735,22 @@ class CEFVerifier:
         checks_passed = 0
         checks_total = 0
         
-        # Check 1: Core library exists
-        checks_total += 1
         lib_names = {
             "Windows": "libcef.dll",
             "Darwin": "libcef.dylib",
             "Linux": "libcef.so"
         }
         lib_name = lib_names.get(self.os_type, "libcef.so")
+        required_resources = ["cef.pak", "cef_100_percent.pak", "cef_200_percent.pak"]
+        
+        # One traversal answers every check below
+        found_files, found_dirs = self._scan(
+            cef_dir, {lib_name, *required_resources}, {"locales"}
+        )
         
-        lib_path = self._find_file(cef_dir, lib_name)
+        # Check 1: Core library exists
+        checks_total += 1
+        lib_path = found_files.get(lib_name)
         if lib_path:
             self.logger.log(f"✓ Core library found: {lib_path}")
             checks_passed += 1
@@ -688,12 +1759,7 @@ class CEFVerifier:
         
         # Check 2: Resources exist
         checks_total += 1
-        required_resources = ["cef.pak", "cef_100_percent.pak", "cef_200_percent.pak"]
-        resources_found = 0
-        
-        for resource in required_resources:
-            if self._find_file(cef_dir, resource):
-                resources_found += 1
+        resources_found = sum(1 for resource in required_resources if resource in found_files)
         
         if resources_found >= 1:  # At least one resource file
             self.logger.log(f"✓ Resources found: {resources_found}/{len(required_resources)}")
@@ -703,7 +1769,7 @@ class CEFVerifier:
         
         # Check 3: Locales directory
         checks_total += 1
-        locales_dir = self._find_directory(cef_dir, "locales")
+        locales_dir = found_dirs.get("locales")
         if locales_dir:
             locale_count = len(list(locales_dir.glob("*.pak")))
             self.logger.log(f"✓ Locales directory found with {locale_count} locales")
@@ -723,24 +1789,50 @@ class CEFVerifier:
         self.logger.log("=" * 70 + "\n")
         return success
     
-    def _find_file(self, directory: Path, filename: str) -> Optional[Path]:
-        """Find a file in directory tree."""
-        for root, dirs, files in os.walk(directory):
-            if filename in files:
-                return Path(root) / filename
-        return None
-    
-    def _find_directory(self, directory: Path, dirname: str) -> Optional[Path]:
-        """Find a directory in directory tree."""
+    def _scan(self, directory: Path, filenames: Set[str], dirnames: Set[str]) -> Tuple[Dict[str, Path], Dict[str, Path]]:
+        """
+        Walk the directory tree once, recording the first match for each name.
+        
+        Returns:
+            Tuple of (found_files, found_dirs) mapping name to path
+        """
+        found_files = {}
+        found_dirs = {}
         for root, dirs, files in os.walk(directory):
-            if dirname in dirs:
-                return Path(root) / dirname
-        return None
+            for name in filenames.intersection(files):
+                found_files.setdefault(name, Path(root) / name)
+            for name in dirnames.intersection(dirs):
+                found_dirs.setdefault(name, Path(root) / name)
+            if len(found_files) == len(filenames) and len(found_dirs) == len(dirnames):
+                break
+        return found_files, found_dirs
 
 
 class ReportGenerator:
     """Generates upgrade reports."""
     
+    # report.json is gzipped past this size
+    JSON_GZIP_THRESHOLD = 64 * 1024
+    
+    # Next-steps lines keyed on 'dry_run' or the run status
+    NEXT_STEPS = {
+        'dry_run': (
+            "This was a dry run. To perform the actual upgrade:",
+            "1. Review this report",
+            "2. Run the agent again without `--dry-run`",
+        ),
+        'success': (
+            "1. Test your application with the new CEF version",
+            "2. Monitor for any compatibility issues",
+            "3. Keep the backup until you're confident the upgrade is stable",
+        ),
+        'default': (
+            "1. Review the error logs",
+            "2. Check the troubleshooting section in the documentation",
+            "3. Consider trying a different CEF version",
+        ),
+    }
+    
     def __init__(self, logger: Logger, log_dir: Path):
         self.logger = logger
         self.log_dir = log_dir
@@ -748,173 +1840,177 @@ class ReportGenerator:
     def generate_report(self, results: Dict):
         """Generate a comprehensive upgrade report."""
         report_path = self.log_dir / "README.md"
-        
-        report_content = f"""# CEF Upgrade Report
-
-**Generated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
-
-## Summary
-
-- **Target Version**: {results.get('target_version', 'N/A')}
-- **Dry Run**: {results.get('dry_run', False)}
-- **Status**: {results.get('status', 'Unknown')}
-
-## Detection Results
-
-{self._format_detection_results(results.get('detection', {}))}
-
-## Vulnerability Check
-
-{self._format_vulnerability_results(results.get('vulnerabilities', {}))}
-
-## Backup
-
-{self._format_backup_results(results.get('backup', {}))}
-
-## Download
-
-{self._format_download_results(results.get('download', {}))}
-
-## Installation
-
-{self._format_installation_results(results.get('installation', {}))}
-
-## Verification
-
-{self._format_verification_results(results.get('verification', {}))}
-
-## Rollback Instructions
-
-If you need to rollback this upgrade:
-
-1. Stop any applications using CEF
-2. Restore from backup:
-   ```bash
-   tar -xzf {results.get('backup', {}).get('path', 'backup.tar.gz')} -C /
-   ```
-3. Restart your applications
-
-## Logs
-
-- Commands Log: `{self.log_dir / 'commands.log'}`
-- JSONL Log: `{self.log_dir / 'agent-run.jsonl'}`
-
-## Next Steps
-
-{self._format_next_steps(results)}
-"""
-        
-        report_path.write_text(report_content, encoding="utf-8")
+        json_path, json_data = self._encode_results(results)
+        
+        # Sections append their lines to one list that is joined and written once
+        parts: List[str] = [
+            "# CEF Upgrade Report",
+            "",
+            f"**Generated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}",
+            "",
+            "## Summary",
+            "",
+            f"- **Target Version**: {results.get('target_version', 'N/A')}",
+            f"- **Dry Run**: {results.get('dry_run', False)}",
+            f"- **Status**: {results.get('status', 'Unknown')}",
+            "",
+        ]
+        
+        sections = (
+            ("Detection Results", self._format_detection_results, 'detection'),
+            ("Vulnerability Check", self._format_vulnerability_results, 'vulnerabilities'),
+            ("Backup", self._format_backup_results, 'backup'),
+            ("Download", self._format_download_results, 'download'),
+            ("Installation", self._format_installation_results, 'installation'),
+            ("Verification", self._format_verification_results, 'verification'),
+        )
+        for title, formatter, key in sections:
+            parts.append(f"## {title}")
+            parts.append("")
+            formatter(results.get(key, {}), parts)
+            parts.append("")
+        
+        parts.extend([
+            "## Rollback Instructions",
+            "",
+            "If you need to rollback this upgrade:",
+            "",
+            "1. Stop any applications using CEF",
+            "2. Restore from backup:",
+            "   ```bash",
+            f"   {self._format_rollback_command(results.get('backup', {}))}",
+            "   ```",
+            "3. Restart your applications",
+            "",
+            "## Logs",
+            "",
+            f"- Commands Log: `{self.log_dir / 'commands.log'}`",
+            f"- JSONL Log: `{self.log_dir / 'agent-run.jsonl'}`",
+            f"- Results JSON: `{json_path}`",
+            "",
+            "## Next Steps",
+            "",
+        ])
+        self._format_next_steps(results, parts)
+        parts.append("")
+        
+        report_path.write_bytes("\n".join(parts).encode("utf-8"))
+        json_path.write_bytes(json_data)
         self.logger.log(f"Report generated: {report_path}")
     
-    def _format_detection_results(self, detection: Dict) -> str:
+    def _encode_results(self, results: Dict) -> Tuple[Path, bytes]:
+        """Serialize the raw results for report.json, gzipped when large."""
+        data = json.dumps(results, default=str, separators=(",", ":")).encode("utf-8")
+        json_path = self.log_dir / "report.json"
+        stale = json_path.with_suffix(".json.gz")
+        if len(data) > self.JSON_GZIP_THRESHOLD:
+            data = gzip.compress(data, compresslevel=1)
+            json_path, stale = stale, json_path
+        if stale.exists():
+            stale.unlink()
+        return json_path, data
+    
+    def _format_rollback_command(self, backup: Dict) -> str:
+        path = str(backup.get('path') or 'backup.tar.gz')
+        if '.tar' not in Path(path).name:
+            return f"cp -a {path}/. /"
+        if path.endswith('.zst'):
+            return f"tar --use-compress-program=unzstd -xf {path} -C /"
+        return f"tar -xzf {path} -C /"
+    
+    def _format_detection_results(self, detection: Dict, out: List[str]):
         if not detection:
-            return "No detection performed"
-        
-        if detection.get('found'):
-            return f"""
-- **Found**: Yes
-- **Version**: {detection.get('version', 'Unknown')}
-- **Chromium Version**: {detection.get('chromium_version', 'Unknown')}
-- **Architecture**: {detection.get('architecture', 'Unknown')}
-- **Paths**: {', '.join(str(p) for p in detection.get('paths', []))}
-"""
+            out.append("No detection performed")
+        elif detection.get('found'):
+            out.extend([
+                "- **Found**: Yes",
+                f"- **Version**: {detection.get('version', 'Unknown')}",
+                f"- **Chromium Version**: {detection.get('chromium_version', 'Unknown')}",
+                f"- **Architecture**: {detection.get('architecture', 'Unknown')}",
+                f"- **Paths**: {', '.join(str(p) for p in detection.get('paths', []))}",
+            ])
         else:
-            return "- **Found**: No existing CEF installation detected"
+            out.append("- **Found**: No existing CEF installation detected")
     
-    def _format_vulnerability_results(self, vulns: Dict) -> str:
+    def _format_vulnerability_results(self, vulns: Dict, out: List[str]):
         if not vulns:
-            return "No vulnerability check performed"
-        
-        if vulns.get('has_critical'):
-            return f"""
-- **Status**: ❌ CRITICAL VULNERABILITIES FOUND
-- **Count**: {len(vulns.get('list', []))}
-- **Action**: Upgrade aborted
-"""
+            out.append("No vulnerability check performed")
+        elif vulns.get('has_critical'):
+            out.extend([
+                "- **Status**: ❌ CRITICAL VULNERABILITIES FOUND",
+                f"- **Count**: {len(vulns.get('list', []))}",
+                "- **Action**: Upgrade aborted",
+            ])
         elif vulns.get('list'):
-            return f"""
-- **Status**: ⚠ Minor vulnerabilities found
-- **Count**: {len(vulns.get('list', []))}
-- **Action**: Proceeded with caution
-"""
+            out.extend([
+                "- **Status**: ⚠ Minor vulnerabilities found",
+                f"- **Count**: {len(vulns.get('list', []))}",
+                "- **Action**: Proceeded with caution",
+            ])
         else:
-            return "- **Status**: ✓ No known vulnerabilities"
+            out.append("- **Status**: ✓ No known vulnerabilities")
     
-    def _format_backup_results(self, backup: Dict) -> str:
+    def _format_backup_results(self, backup: Dict, out: List[str]):
         if not backup:
-            return "No backup created"
-        
-        if backup.get('path'):
-            return f"""
-- **Path**: `{backup['path']}`
-- **Size**: {backup.get('size_mb', 0):.2f} MB
-"""
+            out.append("No backup created")
+        elif backup.get('path'):
+            out.extend([
+                f"- **Path**: `{backup['path']}`",
+                f"- **Size**: {backup.get('size_mb', 0):.2f} MB",
+            ])
         else:
-            return "- **Status**: Backup failed or skipped"
+            out.append("- **Status**: Backup failed or skipped")
     
-    def _format_download_results(self, download: Dict) -> str:
+    def _format_download_results(self, download: Dict, out: List[str]):
         if not download:
-            return "No download performed"
-        
-        if download.get('path'):
-            return f"""
-- **Path**: `{download['path']}`
-- **URL**: {download.get('url', 'N/A')}
-"""
+            out.append("No download performed")
+        elif download.get('installed'):
+            out.extend([
+                f"- **URL**: {download['url']}",
+                "- **Status**: Skipped (this build is already installed)",
+            ])
+        elif download.get('path'):
+            out.extend([
+                f"- **Path**: `{download['path']}`",
+                f"- **URL**: {download.get('url', 'N/A')}",
+            ])
+        elif download.get('url'):
+            out.extend([
+                f"- **URL**: {download['url']}",
+                "- **Mode**: Streamed and extracted (no archive kept)",
+            ])
         else:
-            return "- **Status**: Download failed or skipped"
+            out.append("- **Status**: Download failed or skipped")
     
-    def _format_installation_results(self, installation: Dict) -> str:
+    def _format_installation_results(self, installation: Dict, out: List[str]):
         if not installation:
-            return "No installation performed"
-        
-        if installation.get('success'):
-            return f"""
-- **Status**: ✓ Success
-- **Target Directory**: `{installation.get('target_dir', 'N/A')}`
-"""
+            out.append("No installation performed")
+        elif installation.get('success'):
+            status = "✓ Already installed (skipped)" if installation.get('skipped') else "✓ Success"
+            out.extend([
+                f"- **Status**: {status}",
+                f"- **Target Directory**: `{installation.get('target_dir', 'N/A')}`",
+            ])
         else:
-            return f"""
-- **Status**: ✗ Failed
-- **Error**: {installation.get('error', 'Unknown error')}
-"""
+            out.extend([
+                "- **Status**: ✗ Failed",
+                f"- **Error**: {installation.get('error', 'Unknown error')}",
+            ])
     
-    def _format_verification_results(self, verification: Dict) -> str:
+    def _format_verification_results(self, verification: Dict, out: List[str]):
         if not verification:
-            return "No verification performed"
-        
-        if verification.get('success'):
-            return f"""
-- **Status**: ✓ Passed
-- **Checks**: {verification.get('checks_passed', 0)}/{verification.get('checks_total', 0)}
-"""
-        else:
-            return f"""
-- **Status**: ⚠ Incomplete
-- **Checks**: {verification.get('checks_passed', 0)}/{verification.get('checks_total', 0)}
-"""
+            out.append("No verification performed")
+            return
+        
+        status = "✓ Passed" if verification.get('success') else "⚠ Incomplete"
+        out.extend([
+            f"- **Status**: {status}",
+            f"- **Checks**: {verification.get('checks_passed', 0)}/{verification.get('checks_total', 0)}",
+        ])
     
-    def _format_next_steps(self, results: Dict) -> str:
-        if results.get('dry_run'):
-            return """
-This was a dry run. To perform the actual upgrade:
-1. Review this report
-2. Run the agent again without `--dry-run`
-"""
-        elif results.get('status') == 'success':
-            return """
-1. Test your application with the new CEF version
-2. Monitor for any compatibility issues
-3. Keep the backup until you're confident the upgrade is stable
-"""
-        else:
-            return """
-1. Review the error logs
-2. Check the troubleshooting section in the documentation
-3. Consider trying a different CEF version
-"""
-
+    def _format_next_steps(self, results: Dict, out: List[str]):
+        key = 'dry_run' if results.get('dry_run') else results.get('status')
+        out.extend(self.NEXT_STEPS.get(key, self.NEXT_STEPS['default']))
 
 class CEFUpgradeAgent:
     """Main agent orchestrating the CEF upgrade process."""
@@ -925,15 +2021,16 @@ class CEFUpgradeAgent:
         # Setup directories
         self.log_dir = Path(args.log_dir) / datetime.now().strftime("%Y%m%d_%H%M%S")
         self.backup_dir = Path(args.backup_dir)
-        self.download_dir = Path("temp/cef-downloads")
+        self.download_dir = Path(args.download_dir)
         self.download_dir.mkdir(parents=True, exist_ok=True)
+        self.target_dir = Path(args.install_dir) if args.install_dir else Path("cef_installation")
         
         # Initialize components
         self.logger = Logger(self.log_dir)
-        self.vuln_checker = VulnerabilityChecker(self.logger)
+        self.vuln_checker = VulnerabilityChecker(self.logger, args.vuln_cache_ttl)
         self.detector = CEFDetector(self.logger)
-        self.backup = CEFBackup(self.logger, self.backup_dir)
-        self.downloader = CEFDownloader(self.logger)
+        self.backup = CEFBackup(self.logger, self.backup_dir, args.backup_snapshot)
+        self.downloader = CEFDownloader(self.logger, args.download_parallelism)
         self.installer = CEFInstaller(self.logger)
         self.verifier = CEFVerifier(self.logger)
         self.reporter = ReportGenerator(self.logger, self.log_dir)
@@ -955,6 +2052,14 @@ class CEFUpgradeAgent:
         self.logger.log(f"App Path: {self.args.app_path or 'System-wide'}")
         self.logger.log("=" * 70 + "\n")
         
+        # Step 4 (download and extract into the temp directory) starts right
+        # away in a worker thread; steps 1-3 run meanwhile in this thread, so
+        # its progress line stays hidden until they are done
+        extract_dir = self.download_dir / "extracted"
+        self.logger.show_progress(False)
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cef-download")
+        download_future = executor.submit(self._download_and_extract, extract_dir)
+        
         try:
             # Step 1: Vulnerability Check
             has_critical, vulns = self.vuln_checker.check_version(self.args.target_version)
@@ -964,6 +2069,9 @@ class CEFUpgradeAgent:
             }
             
             if has_critical:
+                self.downloader.cancel()
+                download_future.result()
+                shutil.rmtree(extract_dir, ignore_errors=True)
                 self.results['status'] = 'aborted_vulnerabilities'
                 self.reporter.generate_report(self.results)
                 return 1
@@ -974,43 +2082,36 @@ class CEFUpgradeAgent:
             
             # Step 3: Backup
             if detection['found'] and detection['paths']:
-                backup_path = self.backup.create_backup(detection['paths'], self.args.dry_run)
+                backup_path, backup_size = self.backup.create_backup(detection['paths'], self.args.dry_run)
                 self.results['backup'] = {
                     'path': backup_path,
-                    'size_mb': backup_path.stat().st_size / (1024*1024) if backup_path and backup_path.exists() else 0
+                    'size_mb': backup_size / (1024*1024)
                 }
             
-            # Step 4: Download
-            download_path = self.downloader.download_cef(
-                self.args.target_version,
-                self.download_dir,
-                self.args.dry_run
-            )
+            # Step 4: Wait for the download
+            self.logger.show_progress(True)
+            download, failed_stage = download_future.result()
             
-            if not download_path:
-                self.results['status'] = 'failed_download'
+            if not download:
+                self.results['status'] = f"failed_{failed_stage}"
                 self.reporter.generate_report(self.results)
                 return 1
             
-            self.results['download'] = {
-                'path': download_path,
-                'url': self.downloader.get_download_url(self.args.target_version)
-            }
+            self.results['download'] = download
             
-            # Step 5: Extract
-            extract_dir = self.download_dir / "extracted"
-            if not self.installer.extract_archive(download_path, extract_dir, self.args.dry_run):
-                self.results['status'] = 'failed_extraction'
-                self.reporter.generate_report(self.results)
-                return 1
-            
-            # Step 6: Install
-            target_dir = Path(self.args.install_dir) if self.args.install_dir else Path("cef_installation")
-            install_success = self.installer.install_cef(extract_dir, target_dir, self.args.dry_run)
+            # Step 5: Install
+            target_dir = self.target_dir
+            if download.get('installed'):
+                install_success = True
+            else:
+                install_success = self.installer.install_cef(
+                    extract_dir, target_dir, self.args.dry_run, download.get('sha1')
+                )
             
             self.results['installation'] = {
                 'success': install_success,
-                'target_dir': target_dir
+                'target_dir': target_dir,
+                'skipped': bool(download.get('installed'))
             }
             
             if not install_success:
@@ -1018,7 +2119,7 @@ class CEFUpgradeAgent:
                 self.reporter.generate_report(self.results)
                 return 1
             
-            # Step 7: Verify
+            # Step 6: Verify
             verify_success = self.verifier.verify_installation(target_dir, self.args.dry_run)
             self.results['verification'] = {
                 'success': verify_success,
@@ -1046,10 +2147,69 @@ class CEFUpgradeAgent:
             self.results['error'] = str(e)
             self.reporter.generate_report(self.results)
             return 1
+        
+        finally:
+            # Stops the download if an error cut the run short; a no-op once it finished
+            self.downloader.cancel()
+            executor.shutdown(wait=True)
+            self.logger.close()
+    
+    def _download_and_extract(self, extract_dir: Path) -> Tuple[Optional[Dict], Optional[str]]:
+        """
+        Download and extract the target version into extract_dir.
+        
+        Returns:
+            (the report's download entry, None) on success, or
+            (None, 'download' or 'extraction') naming the step that failed
+        """
+        # The builds index publishes each archive's SHA-1, so an install made
+        # from the same archive is recognised before anything is downloaded
+        sha1 = None
+        if REQUESTS_AVAILABLE:
+            url = self.downloader.get_download_url(self.args.target_version)
+            sha1 = self.downloader.checksums.get(url)
+            if sha1 and not self.args.force_reextract and self.installer.is_installed(self.target_dir, sha1):
+                self.logger.log(f"✓ {self.target_dir} already holds this build (SHA-1 {sha1})")
+                self.logger.log("  Skipping download, extraction and installation (use --force-reextract to redo)\n")
+                return {'url': url, 'sha1': sha1, 'installed': True}, None
+        
+        # Start from an empty staging directory so a tree left by an earlier
+        # (or interrupted) run is never picked up and installed
+        if extract_dir.exists() and not self.args.dry_run:
+            shutil.rmtree(extract_dir)
+        
+        if self.args.download_parallelism > 1:
+            # Parallel ranged download to disk, then extract the archive
+            download_path = self.downloader.download_cef(
+                self.args.target_version,
+                self.download_dir,
+                self.args.dry_run
+            )
+            
+            if not download_path:
+                return None, 'download'
+            if not self.installer.extract_archive(download_path, extract_dir, self.args.dry_run):
+                return None, 'extraction'
+            
+            return {
+                'path': download_path,
+                'url': self.downloader.get_download_url(self.args.target_version),
+                'sha1': sha1
+            }, None
+        
+        # Single connection streamed straight into extraction
+        download_url = self.downloader.download_and_extract(
+            self.args.target_version,
+            extract_dir,
+            self.args.dry_run
+        )
+        if not download_url:
+            return None, self.downloader.failed_stage
+        return {'url': download_url, 'sha1': sha1}, None
 
 
-def main():
-    """Main entry point."""
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments (sys.argv[1:] when argv is None)."""
     parser = argparse.ArgumentParser(
         description="CEF (Chromium Embedded Framework) Upgrade Agent",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -1088,25 +2248,69 @@ Examples:
         help="Simulate the process without making changes"
     )
     
+    parser.add_argument(
+        "--download-dir",
+        default="temp/cef-downloads",
+        help="Directory for the downloaded archive and its extraction (default: temp/cef-downloads)"
+    )
+    
     parser.add_argument(
         "--backup-dir",
         default="temp/cef-agent-backups",
         help="Directory to store backups (default: temp/cef-agent-backups)"
     )
     
+    parser.add_argument(
+        "--backup-snapshot",
+        action="store_true",
+        help="Back up into a plain directory copy instead of a compressed archive "
+             "(near-instant copy-on-write clones on btrfs/XFS)"
+    )
+    
     parser.add_argument(
         "--log-dir",
         default="temp/cef-agent-logs",
         help="Directory to store logs (default: temp/cef-agent-logs)"
     )
     
-    args = parser.parse_args()
+    parser.add_argument(
+        "--download-parallelism",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Download the archive over N concurrent range requests before extracting; "
+             "the archive is kept and reused by later runs "
+             "(default: 1, stream straight into extraction without keeping it)"
+    )
     
-    # Run the agent
-    agent = CEFUpgradeAgent(args)
-    exit_code = agent.run()
+    parser.add_argument(
+        "--vuln-cache-ttl",
+        type=int,
+        default=ResponseCache.MAX_AGE,
+        metavar="SECONDS",
+        help="Reuse cached OSV vulnerability data younger than this without contacting "
+             f"the server (default: {ResponseCache.MAX_AGE}, 0 always revalidates)"
+    )
+    
+    parser.add_argument(
+        "--force-reextract",
+        action="store_true",
+        help="Download, extract and install even if the install directory already "
+             "holds the same CEF build"
+    )
     
-    sys.exit(exit_code)
+    return parser.parse_args(argv)
+
+
+def run(args: argparse.Namespace) -> int:
+    """Run the agent with parsed arguments and return its exit code."""
+    agent = CEFUpgradeAgent(args)
+    return agent.run()
+
+
+def main():
+    """Main entry point."""
+    sys.exit(run(parse_args()))
 
 
 if __name__ == "__main__":
@@ -10,7 +10,9 @@ Tests the build automation functionality including:
 - Binary collection
 """
 
+import shutil
 import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch, MagicMock
@@ -28,12 +30,35 @@ from cef_build_agent import (
 )
 
 
+class LoggerTestCase(unittest.TestCase):
+    """Base class sharing one logger and private log directory per test class."""
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.log_dir = Path(tempfile.mkdtemp(prefix="cef-build-test-"))
+        cls.logger = Logger(cls.log_dir)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.logger.close()
+        shutil.rmtree(cls.log_dir, ignore_errors=True)
+    
+    def make_work_dir(self) -> Path:
+        """Create a scratch directory that is removed when the test ends."""
+        work_dir = Path(tempfile.mkdtemp(prefix="cef-build-test-"))
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        return work_dir
+
+
 class TestLogger(unittest.TestCase):
     """Test Logger functionality."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
+        # Each test gets a fresh logger, since some of them close it
+        self.log_dir = Path(tempfile.mkdtemp(prefix="cef-build-test-"))
+        self.addCleanup(shutil.rmtree, self.log_dir, ignore_errors=True)
         self.logger = Logger(self.log_dir)
+        self.addCleanup(self.logger.close)
     
     def test_logger_creation(self):
         """Test logger creates necessary files."""
@@ -49,13 +74,39 @@ class TestLogger(unittest.TestCase):
         log_content = (self.log_dir / "build-commands.log").read_text()
         self.assertIn("Test message", log_content)
 
+    def test_close(self):
+        """Test closing the logger flushes the log files."""
+        self.logger.log("Closing message", "INFO")
+        self.logger.close()
+        self.logger.close()  # Safe to call twice
+
+        jsonl_content = (self.log_dir / "build-run.jsonl").read_text()
+        self.assertIn("Closing message", jsonl_content)
+    
+    def test_debug_messages_below_verbosity(self):
+        """Test debug messages are kept out of the JSONL log by default."""
+        self.logger.log_debug("Debug message")
+        self.logger.close()
+        
+        self.assertIn("Debug message", (self.log_dir / "build-commands.log").read_text())
+        self.assertNotIn("Debug message", (self.log_dir / "build-run.jsonl").read_text())
+
+    def test_command_recorded_without_console_echo(self):
+        """Test commands reach the JSONL log but are not echoed to the console."""
+        with patch('cef_build_agent.sys.stdout') as mock_stdout:
+            self.logger.log_command("cmake --build .", "", 0)
+        self.logger.close()
 
-class TestCMakeDownloader(unittest.TestCase):
+        echoed = "".join(call[0][0] for call in mock_stdout.write.call_args_list)
+        self.assertNotIn("COMMAND:", echoed)
+        self.assertIn("RETURN CODE: 0", echoed)
+        self.assertIn("COMMAND: cmake --build .", (self.log_dir / "build-run.jsonl").read_text())
+
+
+class TestCMakeDownloader(LoggerTestCase):
     """Test CMake downloader."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
-        self.logger = Logger(self.log_dir)
         self.downloader = CMakeDownloader(self.logger)
     
     def test_get_download_url(self):
@@ -70,14 +121,73 @@ class TestCMakeDownloader(unittest.TestCase):
         """Test download fails gracefully without requests library."""
         result = self.downloader.download_cmake("3.30.1", Path("temp/downloads"))
         self.assertIsNone(result)
+    
+    def test_get_cmake_checksums(self):
+        """Test published checksums are parsed from the cached checksum file."""
+        download_dir = self.make_work_dir()
+        (download_dir / "cmake-3.30.1-SHA-256.txt").write_text(
+            "ABC123  cmake-3.30.1-windows-x86_64.zip\n"
+            "def456  cmake-3.30.1-linux-x86_64.tar.gz\n"
+        )
+        
+        checksums = self.downloader.get_cmake_checksums("3.30.1", download_dir)
+        
+        self.assertEqual(checksums["cmake-3.30.1-windows-x86_64.zip"], "abc123")
+        self.assertEqual(checksums["cmake-3.30.1-linux-x86_64.tar.gz"], "def456")
+    
+    def test_extract_cmake(self):
+        """Test cmake is located from the archive listing and extraction is reused."""
+        import io
+        import tarfile
+        
+        work_dir = self.make_work_dir()
+        
+        self.downloader.os_type = "Linux"
+        archive_name = self.downloader.get_cmake_download_url("3.30.1").split("/")[-1]
+        archive = work_dir / archive_name
+        with tarfile.open(archive, 'w:gz') as tf:
+            for name in ["cmake-3.30.1/bin/cmake", "cmake-3.30.1/share/cmake-3.30/README"]:
+                tf.addfile(tarfile.TarInfo(name), io.BytesIO(b""))
+        
+        extract_dir = work_dir / "extracted"
+        expected = extract_dir / "cmake-3.30.1" / "bin" / "cmake"
+        
+        self.assertIsNone(self.downloader.find_extracted_cmake("3.30.1", extract_dir))
+        self.assertEqual(self.downloader.extract_cmake(archive, extract_dir), expected)
+        
+        # Later runs reuse the extraction without needing the archive
+        archive.unlink()
+        self.assertEqual(self.downloader.extract_cmake(archive, extract_dir), expected)
+        self.assertEqual(self.downloader.find_extracted_cmake("3.30.1", extract_dir), expected)
+    
+    def test_extract_cmake_zip(self):
+        """Test zip archives are fully extracted by the parallel extractor."""
+        import zipfile
+        
+        work_dir = self.make_work_dir()
+        
+        archive = work_dir / "cmake-3.30.1-windows-x86_64.zip"
+        names = [f"cmake-3.30.1-windows-x86_64/share/cmake-3.30/Modules/m{i}.cmake" for i in range(40)]
+        with zipfile.ZipFile(archive, 'w') as zf:
+            zf.writestr("cmake-3.30.1-windows-x86_64/bin/", "")
+            zf.writestr("cmake-3.30.1-windows-x86_64/bin/cmake.exe", "exe")
+            for name in names:
+                zf.writestr(name, name)
+        
+        self.downloader.os_type = "Windows"
+        extract_dir = work_dir / "extracted"
+        
+        cmake_exe = self.downloader.extract_cmake(archive, extract_dir)
+        
+        self.assertEqual(cmake_exe, extract_dir / "cmake-3.30.1-windows-x86_64" / "bin" / "cmake.exe")
+        for name in names:
+            self.assertEqual((extract_dir / name).read_text(), name)
 
 
-class TestCMakeConfigurator(unittest.TestCase):
+class TestCMakeConfigurator(LoggerTestCase):
     """Test CMake configurator."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
-        self.logger = Logger(self.log_dir)
         self.cmake_path = Path("cmake")  # Dummy path
         self.configurator = CMakeConfigurator(self.logger, self.cmake_path)
     
@@ -97,14 +207,81 @@ class TestCMakeConfigurator(unittest.TestCase):
             dry_run=True
         )
         self.assertTrue(result)
+    
+    def _configured_build_dir(self, cache: str, generated: bool = True) -> Path:
+        """Create a build tree holding the given CMakeCache.txt contents."""
+        build_dir = self.make_work_dir()
+        (build_dir / "CMakeCache.txt").write_text(cache)
+        if generated:
+            (build_dir / "CMakeFiles").mkdir()
+            (build_dir / "CMakeFiles" / "generate.stamp").write_text("")
+        return build_dir
+    
+    def test_configure_reuses_existing_cache(self):
+        """Test configure is skipped when the build tree is already configured."""
+        build_dir = self._configured_build_dir(
+            "CMAKE_GENERATOR:INTERNAL=Visual Studio 17 2022\n"
+            "CMAKE_GENERATOR_PLATFORM:INTERNAL=x64\n"
+        )
+        self.configurator.os_type = "Windows"
+        
+        with patch('cef_build_agent.subprocess.run') as mock_run:
+            result = self.configurator.configure(
+                Path("source"),
+                build_dir,
+                "Visual Studio 17 2022",
+                "x64"
+            )
+        
+        self.assertTrue(result)
+        mock_run.assert_not_called()
+        self.assertFalse(self.configurator.runtime_configured)
+    
+    def test_configure_mismatched_generator(self):
+        """Test a cache made with another generator or platform is reconfigured."""
+        caches = [
+            "CMAKE_GENERATOR:INTERNAL=Visual Studio 16 2019\nCMAKE_GENERATOR_PLATFORM:INTERNAL=x64\n",
+            "CMAKE_GENERATOR:INTERNAL=Visual Studio 17 2022\nCMAKE_GENERATOR_PLATFORM:INTERNAL=Win32\n",
+        ]
+        for cache in caches:
+            build_dir = self._configured_build_dir(cache)
+            configurator = CMakeConfigurator(self.logger, self.cmake_path)
+            configurator.os_type = "Windows"
+            
+            with patch('cef_build_agent.subprocess.run') as mock_run:
+                mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+                result = configurator.configure(Path("source"), build_dir, "Visual Studio 17 2022", "x64")
+            
+            self.assertTrue(result)
+            configure_cmd = mock_run.call_args_list[-1][0][0]
+            self.assertIn("-S", configure_cmd)
+            self.assertFalse((build_dir / "CMakeCache.txt").exists())
+    
+    def test_configure_incomplete_generation(self):
+        """Test a cache left by an interrupted configure is not reused."""
+        build_dir = self._configured_build_dir("CMAKE_GENERATOR:INTERNAL=Unix Makefiles\n", generated=False)
+        
+        with patch('cef_build_agent.subprocess.run') as mock_run:
+            mock_run.return_value = Mock(returncode=0, stdout="", stderr="")
+            self.assertTrue(self.configurator.configure(Path("source"), build_dir, "Unix Makefiles"))
+        
+        mock_run.assert_called()
+    
+    def test_reused_cache_with_runtime_library(self):
+        """Test a reused configuration that already sets the runtime library is recognised."""
+        build_dir = self._configured_build_dir(
+            "CMAKE_GENERATOR:INTERNAL=Visual Studio 17 2022\n"
+            "CMAKE_MSVC_RUNTIME_LIBRARY:UNINITIALIZED=MultiThreaded$<$<CONFIG:Debug>:Debug>DLL\n"
+        )
+        
+        self.assertTrue(self.configurator.configure(Path("source"), build_dir, "Visual Studio 17 2022"))
+        self.assertTrue(self.configurator.runtime_configured)
 
 
-class TestVSProjectModifier(unittest.TestCase):
+class TestVSProjectModifier(LoggerTestCase):
     """Test Visual Studio project modifier."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
-        self.logger = Logger(self.log_dir)
         self.modifier = VSProjectModifier(self.logger)
     
     def test_modify_dry_run(self):
@@ -115,14 +292,77 @@ class TestVSProjectModifier(unittest.TestCase):
             dry_run=True
         )
         self.assertTrue(result)
+    
+    def test_modify_runtime_library(self):
+        """Test only the Release runtime library setting is rewritten."""
+        project = (
+            '<?xml version="1.0" encoding="UTF-8"?>\r\n'
+            '<Project DefaultTargets="Build" ToolsVersion="17.0" '
+            'xmlns="http://schemas.microsoft.com/developer/msbuild/2003">\r\n'
+            '  <ItemDefinitionGroup Condition="\'$(Configuration)|$(Platform)\'==\'Debug|x64\'">\r\n'
+            '    <ClCompile>\r\n'
+            '      <RuntimeLibrary>MultiThreadedDebug</RuntimeLibrary>\r\n'
+            '    </ClCompile>\r\n'
+            '  </ItemDefinitionGroup>\r\n'
+            '  <ItemDefinitionGroup Condition="\'$(Configuration)|$(Platform)\'==\'Release|x64\'">\r\n'
+            '    <ClCompile>\r\n'
+            '      <Optimization>MaxSpeed</Optimization>\r\n'
+            '      <RuntimeLibrary>MultiThreaded</RuntimeLibrary>\r\n'
+            '    </ClCompile>\r\n'
+            '  </ItemDefinitionGroup>\r\n'
+            '</Project>\r\n'
+        )
+        vcxproj = self.make_work_dir() / "libcef_dll_wrapper.vcxproj"
+        vcxproj.write_bytes(project.encode("utf-8"))
+        
+        self.assertTrue(self.modifier.modify_runtime_library(vcxproj, "MultiThreadedDLL"))
+        
+        expected = project.replace(
+            "<RuntimeLibrary>MultiThreaded</RuntimeLibrary>",
+            "<RuntimeLibrary>MultiThreadedDLL</RuntimeLibrary>"
+        )
+        self.assertEqual(vcxproj.read_bytes(), expected.encode("utf-8"))
+        
+        # Missing settings are added inside the existing ClCompile block
+        vcxproj.write_bytes(project.replace(
+            "      <RuntimeLibrary>MultiThreaded</RuntimeLibrary>\r\n", ""
+        ).encode("utf-8"))
+        
+        self.assertTrue(self.modifier.modify_runtime_library(vcxproj, "MultiThreadedDLL"))
+        self.assertIn(
+            "<Optimization>MaxSpeed</Optimization>\r\n"
+            "      <RuntimeLibrary>MultiThreadedDLL</RuntimeLibrary>\r\n"
+            "    </ClCompile>",
+            vcxproj.read_bytes().decode("utf-8")
+        )
 
 
-class TestVSBuilder(unittest.TestCase):
+class TestToolCache(unittest.TestCase):
+    """Test Visual Studio tool discovery cache."""
+    
+    def test_cache_invalidated_by_vswhere_change(self):
+        """Test cached values are dropped when vswhere.exe changes."""
+        import os
+        from cef_build_agent import _ToolCache
+        
+        work_dir = Path(tempfile.mkdtemp(prefix="cef-build-test-"))
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        vswhere = work_dir / "vswhere.exe"
+        vswhere.write_text("")
+        os.utime(vswhere, (1000, 1000))
+        cache_path = work_dir / "tool-cache.json"
+        
+        _ToolCache(vswhere, cache_path).set("vs_generator", "Visual Studio 17 2022")
+        self.assertEqual(_ToolCache(vswhere, cache_path).get("vs_generator"), "Visual Studio 17 2022")
+        
+        os.utime(vswhere, (2000, 2000))
+        self.assertIsNone(_ToolCache(vswhere, cache_path).get("vs_generator"))
+
+
+class TestVSBuilder(LoggerTestCase):
     """Test Visual Studio builder."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
-        self.logger = Logger(self.log_dir)
         self.builder = VSBuilder(self.logger)
     
     def test_msbuild_detection(self):
@@ -141,14 +381,25 @@ class TestVSBuilder(unittest.TestCase):
             dry_run=True
         )
         self.assertTrue(result)
+    
+    def test_build_streams_output(self):
+        """Test build output is relayed to the log line by line."""
+        script = self.make_work_dir() / "fake_msbuild.py"
+        script.write_text("import sys\nprint('Build started')\nprint('Build succeeded')\nsys.exit(0)\n")
+        
+        # Run the script with Python in place of MSBuild; the MSBuild switches become its argv
+        self.builder.msbuild_path = Path(sys.executable)
+        self.assertTrue(self.builder.build_project(script, "Release", "x64"))
+        
+        log_content = (self.log_dir / "build-commands.log").read_text()
+        self.assertIn("Build started", log_content)
+        self.assertIn("Build succeeded", log_content)
 
 
-class TestBinaryCollector(unittest.TestCase):
+class TestBinaryCollector(LoggerTestCase):
     """Test binary collector."""
     
     def setUp(self):
-        self.log_dir = Path("temp/test-logs")
-        self.logger = Logger(self.log_dir)
         self.collector = BinaryCollector(self.logger)
     
     def test_collect_dry_run(self):
@@ -160,6 +411,35 @@ class TestBinaryCollector(unittest.TestCase):
             dry_run=True
         )
         self.assertTrue(result)
+    
+    def test_collect_binaries(self):
+        """Test binaries are deployed, including on a rerun over existing output."""
+        work_dir = self.make_work_dir()
+        cef_source = work_dir / "cef_source"
+        build_dir = cef_source / "build"
+        target_dir = work_dir / "output"
+        
+        files = {
+            cef_source / "include" / "cef_app.h": "header",
+            cef_source / "Release" / "libcef.dll": "dll",
+            cef_source / "Release" / "swiftshader" / "libGLESv2.dll": "swiftshader",
+            cef_source / "Resources" / "cef.pak": "pak",
+            cef_source / "Resources" / "locales" / "en-US.pak": "locale",
+            build_dir / "libcef_dll_wrapper" / "Release" / "libcef_dll_wrapper.lib": "lib",
+        }
+        for path, content in files.items():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        
+        for _ in range(2):
+            self.assertTrue(self.collector.collect_binaries(cef_source, build_dir, target_dir))
+        
+        self.assertEqual((target_dir / "include" / "cef_app.h").read_text(), "header")
+        self.assertEqual((target_dir / "libcef.dll").read_text(), "dll")
+        self.assertEqual((target_dir / "swiftshader" / "libGLESv2.dll").read_text(), "swiftshader")
+        self.assertEqual((target_dir / "cef.pak").read_text(), "pak")
+        self.assertEqual((target_dir / "locales" / "en-US.pak").read_text(), "locale")
+        self.assertEqual((target_dir / "libcef_dll_wrapper.lib").read_text(), "lib")
 
 
 class TestIntegration(unittest.TestCase):
@@ -170,20 +450,26 @@ class TestIntegration(unittest.TestCase):
         from cef_build_agent import CEFBuildAgent
         import argparse
         
+        work_dir = Path(tempfile.mkdtemp(prefix="cef-build-test-"))
+        self.addCleanup(shutil.rmtree, work_dir, ignore_errors=True)
+        
         # Create mock args
         args = argparse.Namespace(
-            cef_source="temp/test-cef",
-            output_dir="temp/test-output",
+            cef_source=str(work_dir / "cef"),
+            output_dir=str(work_dir / "output"),
             cmake_path=None,
             cmake_version="3.30.1",
             vs_generator="Visual Studio 17 2022",
             platform="x64",
+            jobs=None,
+            reconfigure=False,
             dry_run=True,
-            log_dir="temp/test-build-logs"
+            log_dir=str(work_dir / "logs"),
+            cmake_dir=str(work_dir / "cmake")
         )
         
         # Create dummy CEF source directory
-        cef_source = Path("temp/test-cef")
+        cef_source = work_dir / "cef"
         cef_source.mkdir(parents=True, exist_ok=True)
         
         # Run agent
@@ -201,18 +487,8 @@ def run_tests():
     print("=" * 70)
     print()
     
-    # Create test suite
-    loader = unittest.TestLoader()
-    suite = unittest.TestSuite()
-    
-    # Add all test cases
-    suite.addTests(loader.loadTestsFromTestCase(TestLogger))
-    suite.addTests(loader.loadTestsFromTestCase(TestCMakeDownloader))
-    suite.addTests(loader.loadTestsFromTestCase(TestCMakeConfigurator))
-    suite.addTests(loader.loadTestsFromTestCase(TestVSProjectModifier))
-    suite.addTests(loader.loadTestsFromTestCase(TestVSBuilder))
-    suite.addTests(loader.loadTestsFromTestCase(TestBinaryCollector))
-    suite.addTests(loader.loadTestsFromTestCase(TestIntegration))
+    # Collect every TestCase in this module, so new classes are never left out
+    suite = unittest.TestLoader().loadTestsFromModule(sys.modules[__name__])
     
     # Run tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -8,6 +8,13 @@ to ensure they work correctly.
 
 import sys
 import os
+import io
+import json
+import shutil
+import subprocess
+import tarfile
+import tempfile
+import threading
 from pathlib import Path
 
 # Add parent directory to path to import the agent
@@ -19,10 +26,88 @@ from cef_upgrade_agent import (
     CEFDetector,
     CEFBackup,
     CEFDownloader,
-    CEFVerifier
+    CEFInstaller,
+    CEFVerifier,
+    ReportGenerator,
+    _extract_tar
 )
 
 
+def _make_tar(members, mode="w"):
+    """Build a tar archive in memory from (name, data) files and (name, "->", target) symlinks."""
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode=mode) as tar:
+        for member in members:
+            info = tarfile.TarInfo(member[0])
+            if member[1] == "->":
+                info.type = tarfile.SYMTYPE
+                info.linkname = member[2]
+                tar.addfile(info)
+            else:
+                info.size = len(member[1])
+                tar.addfile(info, io.BytesIO(member[1]))
+    return buf.getvalue()
+
+
+def _archive_names(archive_path):
+    """List the members of a .tar.gz or .tar.zst backup archive."""
+    if archive_path.suffix != ".zst":
+        with tarfile.open(archive_path) as tar:
+            return tar.getnames()
+    try:
+        import zstandard
+        with open(archive_path, "rb") as fh:
+            data = zstandard.ZstdDecompressor().stream_reader(fh).read()
+    except ImportError:
+        data = subprocess.run(["zstd", "-dc", str(archive_path)], capture_output=True, check=True).stdout
+    with tarfile.open(fileobj=io.BytesIO(data), mode="r|") as tar:
+        return tar.getnames()
+
+
+class _FakeResponse:
+    """Minimal streamed HTTP response serving a byte string."""
+    
+    def __init__(self, status_code, body=b"", headers=None):
+        self.status_code = status_code
+        self.body = body
+        self.headers = headers or {}
+    
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise IOError(f"HTTP {self.status_code}")
+    
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+    
+    def close(self):
+        pass
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _FakeSession:
+    """Serves byte ranges of body, raising for the range that starts at fail_at."""
+    
+    def __init__(self, body, fail_at=None):
+        self.body = body
+        self.fail_at = fail_at
+        self.range_requests = 0
+        self._lock = threading.Lock()
+    
+    def get(self, url, headers=None, **kwargs):
+        start, end = map(int, headers["Range"][len("bytes="):].split("-"))
+        with self._lock:
+            self.range_requests += 1
+        if start == self.fail_at:
+            raise ConnectionError("connection reset")
+        return _FakeResponse(206, self.body[start:end + 1])
+
+
 def test_logger():
     """Test the Logger class."""
     print("=" * 70)
@@ -78,6 +163,17 @@ def test_detector():
     result = detector.detect_cef_in_path()
     
     print(f"Detection result: {result}")
+    
+    # An explicit path is searched in full, even under hidden or Temp directories
+    work_dir = Path(tempfile.mkdtemp(prefix="cef-agent-test-"))
+    try:
+        cef_dir = work_dir / ".app" / "Temp" / "cef"
+        cef_dir.mkdir(parents=True)
+        (cef_dir / "cef.pak").write_bytes(b"")
+        result = detector.detect_cef_in_path(str(work_dir))
+        assert result["found"] and result["paths"] == [cef_dir], "CEF under an explicit path was not found"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
     print("✓ CEFDetector test passed\n")
 
 
@@ -88,19 +184,35 @@ def test_backup():
     print("=" * 70)
     
     log_dir = Path("temp/test-logs")
-    backup_dir = Path("temp/test-backups")
+    work_dir = Path(tempfile.mkdtemp(prefix="cef-agent-test-"))
+    backup_dir = work_dir / "backups"
     logger = Logger(log_dir)
     backup = CEFBackup(logger, backup_dir)
     
-    # Create a test directory to backup
-    test_dir = Path("temp/test-cef")
-    test_dir.mkdir(parents=True, exist_ok=True)
-    (test_dir / "test.txt").write_text("test content")
-    
-    # Test backup creation (dry run)
-    backup_path = backup.create_backup([test_dir], dry_run=True)
-    
-    print(f"Backup path (dry run): {backup_path}")
+    try:
+        # Create a test directory to backup
+        test_dir = work_dir / "test-cef"
+        test_dir.mkdir(parents=True, exist_ok=True)
+        (test_dir / "test.txt").write_text("test content")
+        
+        # Test backup creation (dry run)
+        backup_path, backup_size = backup.create_backup([test_dir], dry_run=True)
+        
+        print(f"Backup path (dry run): {backup_path}")
+        assert backup_size == 0, "Dry run reported a backup size"
+        
+        # Real archive (zstd or gzip, whichever is available) and snapshot backups
+        backup_path, backup_size = backup.create_backup([test_dir])
+        assert backup_path is not None and backup_path.exists(), "Backup archive not created"
+        assert backup_size == backup_path.stat().st_size > 0, "Backup size does not match the archive"
+        assert "test-cef/test.txt" in _archive_names(backup_path), "Backup is missing test.txt"
+        
+        snapshot = CEFBackup(logger, backup_dir, snapshot=True)
+        snapshot_path, snapshot_size = snapshot.create_backup([test_dir])
+        assert (snapshot_path / "test-cef" / "test.txt").read_text() == "test content"
+        assert snapshot_size == len("test content"), "Snapshot size does not match the copied files"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
     print("✓ CEFBackup test passed\n")
 
 
@@ -126,6 +238,91 @@ def test_downloader():
         print("⚠ CEFDownloader test: Could not generate URL\n")
 
 
+def test_range_download():
+    """Test CEFDownloader's concurrent byte-range download."""
+    print("=" * 70)
+    print("Testing ranged download")
+    print("=" * 70)
+    
+    log_dir = Path("temp/test-logs")
+    logger = Logger(log_dir)
+    logger.show_progress(False)
+    work_dir = Path(tempfile.mkdtemp(prefix="cef-agent-test-"))
+    try:
+        body = os.urandom(64 * 1024)
+        
+        downloader = CEFDownloader(logger, parallelism=2)
+        downloader.RANGE_CHUNK_SIZE = 1024
+        downloader.session = _FakeSession(body)
+        assert downloader._download_ranges("https://example.invalid/cef.tar.bz2", work_dir / "cef.tar.bz2", len(body))
+        assert (work_dir / "cef.tar.bz2").read_bytes() == body, "Ranges were reassembled incorrectly"
+        
+        # A range that raises stops the queued ones instead of letting all 64 run
+        downloader.session = _FakeSession(body, fail_at=1024)
+        try:
+            downloader._download_ranges("https://example.invalid/cef.tar.bz2", work_dir / "failed.tar.bz2", len(body))
+            assert False, "A failed range was not reported"
+        except ConnectionError:
+            pass
+        assert downloader.session.range_requests < len(body) // 1024, "Remaining ranges were still fetched"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("✓ Ranged download test passed\n")
+
+
+def test_extraction():
+    """Test archive extraction, including the guard against escaping the target."""
+    print("=" * 70)
+    print("Testing archive extraction")
+    print("=" * 70)
+    
+    log_dir = Path("temp/test-logs")
+    logger = Logger(log_dir)
+    work_dir = Path(tempfile.mkdtemp(prefix="cef-agent-test-"))
+    try:
+        # Both the "data" filter and the manual checks must refuse these
+        unsafe = {
+            "traversal": _make_tar([("../evil.txt", b"evil")]),
+            "symlink": _make_tar([("cef/link", "->", "../../outside")]),
+        }
+        branches = ["manual"]
+        if hasattr(tarfile, "data_filter"):
+            branches.insert(0, "data filter")
+        data_filter = getattr(tarfile, "data_filter", None)
+        try:
+            for branch in branches:
+                if branch == "manual" and data_filter is not None:
+                    del tarfile.data_filter
+                for name, archive in unsafe.items():
+                    dest = work_dir / branch.replace(" ", "-") / name / "out"
+                    dest.mkdir(parents=True)
+                    try:
+                        with tarfile.open(fileobj=io.BytesIO(archive), mode="r|") as tar_ref:
+                            _extract_tar(tar_ref, dest)
+                        assert False, f"{branch}: extracted {name} archive"
+                    except tarfile.TarError:
+                        pass
+                    assert not (dest.parent / "evil.txt").exists(), f"{branch}: wrote outside the target"
+        finally:
+            if data_filter is not None:
+                tarfile.data_filter = data_filter
+        
+        # A downloaded .tar.gz is unpacked by CEFInstaller
+        archive_path = work_dir / "cef_binary_test.tar.gz"
+        archive_path.write_bytes(_make_tar([("cef_binary_test/Release/libcef.so", b"lib")], mode="w:gz"))
+        installer = CEFInstaller(logger)
+        assert installer.extract_archive(archive_path, work_dir / "installed")
+        assert (work_dir / "installed/cef_binary_test/Release/libcef.so").read_bytes() == b"lib"
+        
+        # A streamed .tar.bz2 goes through pbzip2/lbzip2 when installed, tarfile otherwise
+        stream = io.BytesIO(_make_tar([("cef_binary_test/include/cef_version.h", b"header")], mode="w:bz2"))
+        CEFDownloader(logger)._extract_stream(stream, work_dir / "streamed", ".bz2")
+        assert (work_dir / "streamed/cef_binary_test/include/cef_version.h").read_bytes() == b"header"
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+    print("✓ Archive extraction test passed\n")
+
+
 def test_verifier():
     """Test the CEFVerifier class."""
     print("=" * 70)
@@ -147,6 +344,58 @@ def test_verifier():
     print("✓ CEFVerifier test passed\n")
 
 
+def test_report_generator():
+    """Test the ReportGenerator class."""
+    print("=" * 70)
+    print("Testing ReportGenerator")
+    print("=" * 70)
+    
+    log_dir = Path("temp/test-logs")
+    logger = Logger(log_dir)
+    reporter = ReportGenerator(logger, log_dir)
+    
+    results = {
+        'target_version': "120.1.10+g3ce3184+chromium-120.0.6099.129",
+        'dry_run': False,
+        'status': 'success',
+        'detection': {'found': True, 'version': "119.0", 'paths': [Path("/opt/app/cef")]},
+        'vulnerabilities': {'has_critical': False, 'list': []},
+        'backup': {'path': Path("backups/cef_backup.tar.zst"), 'size_mb': 12.5},
+        'download': {'url': "https://cef-builds.spotifycdn.com/cef.tar.bz2"},
+        'installation': {'success': True, 'target_dir': Path("cef_installation")},
+        'verification': {'success': True, 'checks_passed': 3, 'checks_total': 3}
+    }
+    reporter.generate_report(results)
+    report = (log_dir / "README.md").read_text(encoding="utf-8")
+    
+    # Every section is present, in order, and filled from the results
+    headings = ["## Summary", "## Detection Results", "## Vulnerability Check", "## Backup",
+                "## Download", "## Installation", "## Verification",
+                "## Rollback Instructions", "## Logs", "## Next Steps"]
+    positions = [report.find(heading) for heading in headings]
+    assert -1 not in positions, "Report is missing a section"
+    assert positions == sorted(positions), "Report sections are out of order"
+    
+    for expected in ["- **Status**: success",
+                     "- **Version**: 119.0",
+                     "- **Chromium Version**: Unknown",
+                     "- **Status**: ✓ No known vulnerabilities",
+                     "- **Size**: 12.50 MB",
+                     "- **Mode**: Streamed and extracted (no archive kept)",
+                     "- **Checks**: 3/3",
+                     "--use-compress-program=unzstd",
+                     "1. Test your application with the new CEF version"]:
+        assert expected in report, f"Report is missing: {expected}"
+    assert "\n\n\n" not in report, "Report has stray blank lines"
+    
+    # The raw results are written alongside, with paths as strings
+    saved = json.loads((log_dir / "report.json").read_text(encoding="utf-8"))
+    assert saved['status'] == 'success'
+    assert saved['installation']['target_dir'] == "cef_installation"
+    
+    print("✓ ReportGenerator test passed\n")
+
+
 def main():
     """Run all tests."""
     print("\n" + "=" * 70)
@@ -159,7 +408,10 @@ def main():
         ("CEFDetector", test_detector),
         ("CEFBackup", test_backup),
         ("CEFDownloader", test_downloader),
+        ("Ranged download", test_range_download),
+        ("Archive extraction", test_extraction),
         ("CEFVerifier", test_verifier),
+        ("ReportGenerator", test_report_generator),
     ]
     
     passed = 0
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script for CEF Unified Agent
+
+Tests the config matrix scheduling:
+- Grouping configs that share a temp or output directory
+"""
+
+import json
+import shutil
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent))
+
+from cef_unified_agent import _group_by_dirs
+
+
+class TestGroupByDirs(unittest.TestCase):
+    """Test grouping of matrix configs by the directories they write to."""
+
+    def setUp(self):
+        self.config_dir = Path(tempfile.mkdtemp(prefix="cef-unified-test-"))
+        self.addCleanup(shutil.rmtree, self.config_dir, ignore_errors=True)
+
+    def _config(self, name: str, **settings) -> str:
+        path = self.config_dir / f"{name}.json"
+        path.write_text(json.dumps(settings), encoding="utf-8")
+        return str(path)
+
+    def test_distinct_dirs_run_separately(self):
+        """Test that configs with their own directories each get a group."""
+        configs = [
+            self._config("a", temp_directory="temp/a", output_directory="out/a"),
+            self._config("b", temp_directory="temp/b", output_directory="out/b"),
+        ]
+        self.assertEqual(_group_by_dirs(configs), [[0], [1]])
+
+    def test_shared_output_dir_grouped(self):
+        """Test that configs sharing only an output directory are grouped."""
+        configs = [
+            self._config("a", temp_directory="temp/a", output_directory="out/shared"),
+            self._config("b", temp_directory="temp/b", output_directory="out/other"),
+            self._config("c", temp_directory="temp/c", output_directory="out/shared"),
+        ]
+        self.assertEqual(_group_by_dirs(configs), [[1], [0, 2]])
+
+    def test_defaults_and_missing_config_grouped(self):
+        """Test that configs falling back to the default directories are grouped."""
+        configs = [
+            self._config("a"),
+            str(self.config_dir / "missing.json"),
+            self._config("b", temp_directory="temp/b", output_directory="out/b"),
+        ]
+        self.assertEqual(_group_by_dirs(configs), [[0, 1], [2]])
+
+    def test_groups_merged_transitively(self):
+        """Test that a config overlapping two groups merges them."""
+        configs = [
+            self._config("a", temp_directory="temp/a", output_directory="out/a"),
+            self._config("b", temp_directory="temp/b", output_directory="out/b"),
+            self._config("c", temp_directory="temp/a", output_directory="out/b"),
+        ]
+        self.assertEqual(_group_by_dirs(configs), [[0, 1, 2]])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)